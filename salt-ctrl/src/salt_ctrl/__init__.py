@@ -1,3 +1,14 @@
 from __future__ import annotations
 
-from . import constants, core, domain, utils
+import importlib
+
+## Subpackages are imported on first access, so thin entrypoints (i.e. the CLI
+#  talking to a running daemon) don't pay for pandas/pydantic/Dynaconf imports.
+__all__ = ["constants", "core", "domain", "utils"]
+
+
+def __getattr__(name: str):
+    if name in __all__:
+        return importlib.import_module(f".{name}", __name__)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
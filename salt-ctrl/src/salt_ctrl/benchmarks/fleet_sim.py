@@ -0,0 +1,622 @@
+from __future__ import annotations
+
+if __name__ == "__main__":
+    import sys
+
+    sys.path.append(".")
+
+import argparse
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+import ipaddress
+import json
+import random
+
+from pathlib import Path
+import socket
+import tempfile
+import threading
+import time
+
+from salt_ctrl.constants import TEMPLATES_DIR
+from salt_ctrl.domain.inventory import SaltInventory, SaltMaster, SaltMinion
+from salt_ctrl.domain.inventory.sources import JSONInventorySource
+from salt_ctrl.utils.discovery_utils import discover_hosts
+from salt_ctrl.utils.jinja_utils import get_loader_env, load_template_dir
+from salt_ctrl.utils.net_utils import (
+    AdaptiveProber,
+    RetryPolicy,
+    RttEstimator,
+)
+from salt_ctrl.utils.salt_inventory_utils import run_inventory_pipeline
+
+from loguru import logger as log
+
+try:
+    import resource
+except ImportError:
+    ## Not available on Windows
+    resource = None
+
+## Simulated host kinds
+HOST_OK: str = "ok"
+HOST_SLOW: str = "slow"
+HOST_REFUSED: str = "refused"
+HOST_BLACKHOLE: str = "blackhole"
+
+## Probe outcomes
+PROBE_OK: str = "ok"
+PROBE_REFUSED: str = "refused"
+PROBE_TIMEOUT: str = "timeout"
+PROBE_ERROR: str = "error"
+
+SCENARIOS: list[str] = ["probe", "sweep", "pipeline"]
+
+## File descriptors left free for probes, pools & everything else in the process
+_RESERVED_FDS: int = 1024
+
+
+@dataclass
+class FleetProfile:
+    """How simulated hosts behave.
+
+    The *_rate fields are fractions of the fleet, except drop_rate, which is applied
+    to each connection to an answering host (the connection is accepted, but never
+    answered, like a lost packet). Refused hosts have no listener, so connections
+    are reset by the kernel. Blackhole hosts have a listener with a full accept
+    queue, so the kernel drops their SYNs & connections time out.
+    """
+
+    latency_ms: float = 2.0
+    jitter_ms: float = 1.0
+    drop_rate: float = 0.01
+    refused_rate: float = 0.05
+    blackhole_rate: float = 0.02
+    slow_rate: float = 0.05
+    slow_ms: float = 250.0
+
+
+@dataclass
+class ProbeStats:
+    """Outcomes & latencies of probes against the fleet, safe to update from threads."""
+
+    latencies: list[float] = field(default_factory=list)
+    outcomes: dict[str, int] = field(default_factory=dict)
+    started: float = field(default_factory=time.perf_counter)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, outcome: str, latency: float) -> None:
+        with self._lock:
+            self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+            if outcome == PROBE_OK:
+                self.latencies.append(latency)
+
+    def summary(self) -> dict:
+        elapsed: float = time.perf_counter() - self.started
+        probes: int = sum(self.outcomes.values())
+        latencies: list[float] = sorted(self.latencies)
+
+        return {
+            "probes": probes,
+            "seconds": round(elapsed, 3),
+            "probes_per_second": round(probes / max(elapsed, 1e-9), 1),
+            "p50_ms": _percentile(latencies, 50),
+            "p95_ms": _percentile(latencies, 95),
+            "p99_ms": _percentile(latencies, 99),
+            "max_ms": _percentile(latencies, 100),
+            "error_rate": round(1 - self.outcomes.get(PROBE_OK, 0) / max(probes, 1), 4),
+            "outcomes": dict(sorted(self.outcomes.items())),
+        }
+
+
+def _percentile(values: list[float], percent: float) -> float | None:
+    """Nearest-rank percentile of sorted values (seconds), in milliseconds."""
+    if not values:
+        return None
+
+    index: int = max(0, min(len(values) - 1, round(percent / 100 * len(values)) - 1))
+
+    return round(values[index] * 1000, 2)
+
+
+def _raise_fd_limit(needed: int) -> int:
+    """Raise the soft open file limit towards the hard limit, returning the new limit."""
+    if resource is None:
+        return needed
+
+    soft_limit, hard_limit = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft_limit == resource.RLIM_INFINITY or soft_limit >= needed:
+        return soft_limit if soft_limit != resource.RLIM_INFINITY else needed
+
+    target: int = (
+        needed if hard_limit == resource.RLIM_INFINITY else min(needed, hard_limit)
+    )
+    resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard_limit))
+    log.debug(f"Raised open file limit from {soft_limit} to {target}")
+
+    return target
+
+
+class SimulatedFleet:
+    """Thousands of loopback endpoints standing in for a fleet of hosts.
+
+    Each host gets its own address in network (Linux routes all of 127.0.0.0/8 to
+    the loopback interface) with an asyncio listener on port. A probe connects, sends
+    one byte & waits for the reply, which the host sends after its latency; see
+    FleetProfile for the failure modes. Listeners run on an event loop in a background
+    thread, so synchronous probe code (i.e. AdaptiveProber) can drive the fleet from
+    its own threads.
+
+    Use as a context manager, or call start() & stop().
+    """
+
+    def __init__(
+        self,
+        count: int = 1000,
+        profile: FleetProfile | None = None,
+        network: str = "127.64.0.0/16",
+        port: int = 20022,
+        seed: int = 0,
+    ):
+        hosts = ipaddress.ip_network(network).hosts()
+
+        self.network: str = network
+        self.profile: FleetProfile = profile or FleetProfile()
+        self.port: int = port
+        self.stats: ProbeStats = ProbeStats()
+        self.served: dict[str, int] = {"answered": 0, "dropped": 0}
+
+        self._random: random.Random = random.Random(seed)
+        self.kinds: dict[str, str] = {}
+        for _ in range(count):
+            try:
+                address: str = str(next(hosts))
+            except StopIteration:
+                raise ValueError(f"Network {network} has fewer than {count} addresses")
+
+            self.kinds[address] = self._pick_kind()
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._servers: list[asyncio.AbstractServer] = []
+        self._blackholes: list[socket.socket] = []
+
+    def _pick_kind(self) -> str:
+        roll: float = self._random.random()
+
+        for kind, rate in (
+            (HOST_REFUSED, self.profile.refused_rate),
+            (HOST_BLACKHOLE, self.profile.blackhole_rate),
+            (HOST_SLOW, self.profile.slow_rate),
+        ):
+            if roll < rate:
+                return kind
+            roll -= rate
+
+        return HOST_OK
+
+    @property
+    def addresses(self) -> list[str]:
+        return list(self.kinds.keys())
+
+    @property
+    def cidr(self) -> str:
+        """Smallest CIDR range whose usable addresses include the whole fleet.
+
+        The range may include unused addresses after the fleet; on loopback they
+        refuse connections.
+        """
+        network = ipaddress.ip_network(self.network)
+        last = ipaddress.ip_address(self.addresses[-1])
+
+        for prefix in range(network.max_prefixlen - 2, network.prefixlen, -1):
+            candidate = ipaddress.ip_network(f"{network.network_address}/{prefix}")
+            if last < candidate.broadcast_address:
+                return str(candidate)
+
+        return str(network)
+
+    def hosts(self, *kinds: str) -> list[str]:
+        return [address for address, kind in self.kinds.items() if kind in kinds]
+
+    def reset_stats(self) -> ProbeStats:
+        self.stats = ProbeStats()
+        self.served = {"answered": 0, "dropped": 0}
+
+        return self.stats
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        address: str = writer.get_extra_info("sockname")[0]
+
+        try:
+            if not await reader.read(1):
+                return
+
+            if self._random.random() < self.profile.drop_rate:
+                self.served["dropped"] += 1
+                ## Hold the connection until the client gives up
+                await reader.read()
+
+                return
+
+            delay: float = (
+                self.profile.slow_ms
+                if self.kinds[address] == HOST_SLOW
+                else self.profile.latency_ms
+                + self._random.uniform(-1, 1) * self.profile.jitter_ms
+            )
+            await asyncio.sleep(max(0.0, delay) / 1000)
+
+            writer.write(b"!")
+            await writer.drain()
+            self.served["answered"] += 1
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            writer.close()
+
+    async def _start_servers(self) -> None:
+        for address, kind in self.kinds.items():
+            if kind in (HOST_OK, HOST_SLOW):
+                self._servers.append(
+                    await asyncio.start_server(
+                        self._handle, host=address, port=self.port, backlog=1024
+                    )
+                )
+            elif kind == HOST_BLACKHOLE:
+                ## listen(0) queues 1 connection; fill it so further SYNs are dropped
+                listener: socket.socket = socket.socket()
+                listener.bind((address, self.port))
+                listener.listen(0)
+                filler: socket.socket = socket.create_connection(
+                    (address, self.port), timeout=1
+                )
+                self._blackholes.extend([listener, filler])
+
+    async def _stop_servers(self) -> None:
+        for server in self._servers:
+            server.close()
+        for server in self._servers:
+            await server.wait_closed()
+
+    def start(self) -> SimulatedFleet:
+        if self._loop is not None:
+            return self
+
+        ## Listeners, blackhole sockets & 2 per in-flight probe
+        _raise_fd_limit(len(self.kinds) * 2 + _RESERVED_FDS)
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="fleet-sim", daemon=True
+        )
+        self._thread.start()
+
+        start: float = time.perf_counter()
+        try:
+            asyncio.run_coroutine_threadsafe(self._start_servers(), self._loop).result()
+        except Exception as exc:
+            self.stop()
+            raise Exception(
+                f"Unhandled exception starting simulated fleet. Details: {exc}"
+            )
+
+        log.info(
+            f"Started simulated fleet of [{len(self.kinds)}] host(s) on port {self.port} in {time.perf_counter() - start:.2f}s: "
+            + ", ".join(
+                f"{kind}={len(self.hosts(kind))}"
+                for kind in (HOST_OK, HOST_SLOW, HOST_REFUSED, HOST_BLACKHOLE)
+            )
+        )
+
+        return self
+
+    def stop(self) -> None:
+        if self._loop is None:
+            return
+
+        asyncio.run_coroutine_threadsafe(self._stop_servers(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+        for sock in self._blackholes:
+            sock.close()
+
+        self._servers, self._blackholes = [], []
+        self._loop, self._thread = None, None
+
+    def __enter__(self) -> SimulatedFleet:
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def probe(self, host: str = None, timeout: float | None = None) -> bool:
+        """Round-trip one byte to a simulated host. Drop-in probe_func for AdaptiveProber."""
+        if host is None:
+            raise ValueError("Missing host to probe")
+
+        start: float = time.perf_counter()
+
+        try:
+            with socket.create_connection((host, self.port), timeout=timeout) as sock:
+                sock.sendall(b"?")
+                outcome: str = PROBE_OK if sock.recv(1) == b"!" else PROBE_ERROR
+        except ConnectionRefusedError:
+            outcome = PROBE_REFUSED
+        except socket.timeout:
+            outcome = PROBE_TIMEOUT
+        except OSError:
+            outcome = PROBE_ERROR
+
+        self.stats.record(outcome, time.perf_counter() - start)
+
+        return outcome == PROBE_OK
+
+
+def synthetic_inventory(fleet: SimulatedFleet = None) -> SaltInventory:
+    """Build a SaltInventory with one minion per simulated host."""
+    if fleet is None:
+        raise ValueError("Missing simulated fleet")
+
+    return SaltInventory(
+        master=SaltMaster(
+            name="master1", host="127.0.0.1", os_type="linux", distro="ubuntu"
+        ),
+        minions=[
+            SaltMinion(
+                name=f"sim-{address.replace('.', '-')}",
+                host=address,
+                os_type="linux",
+                distro=["ubuntu", "debian", "fedora"][i % 3],
+            )
+            for i, address in enumerate(fleet.addresses)
+        ],
+    )
+
+
+def _prober(fleet: SimulatedFleet, timeout: float) -> AdaptiveProber:
+    return AdaptiveProber(
+        estimator=RttEstimator(
+            initial_rto=timeout, min_rto=min(0.05, timeout), max_rto=timeout * 4
+        ),
+        retry=RetryPolicy(base_delay=0.01),
+        probe_func=fleet.probe,
+    )
+
+
+def _accuracy(fleet: SimulatedFleet, up: dict[str, bool]) -> dict:
+    """Compare per-host results with how the fleet was set up."""
+    answering: set[str] = set(fleet.hosts(HOST_OK, HOST_SLOW))
+
+    return {
+        "hosts": len(up),
+        "up": sum(up.values()),
+        "false_negatives": sum(1 for h, ok in up.items() if not ok and h in answering),
+        "false_positives": sum(1 for h, ok in up.items() if ok and h not in answering),
+    }
+
+
+def run_probe_scenario(
+    fleet: SimulatedFleet = None,
+    inventory: SaltInventory = None,
+    workers: int = 64,
+    timeout: float = 0.5,
+) -> dict:
+    """Probe every minion with SaltMinion.reachable() & an AdaptiveProber."""
+    prober: AdaptiveProber = _prober(fleet, timeout)
+    prober.start_sweep(len(inventory.minions))
+    stats: ProbeStats = fleet.reset_stats()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results: list[bool] = list(
+            pool.map(
+                lambda minion: minion.reachable(spinner=False, prober=prober),
+                inventory.minions,
+            )
+        )
+
+    return {
+        **stats.summary(),
+        **_accuracy(fleet, {m.host: up for m, up in zip(inventory.minions, results)}),
+        "workers": workers,
+        "retries": prober.budget.spent,
+        "served": dict(fleet.served),
+    }
+
+
+def run_sweep_scenario(
+    fleet: SimulatedFleet = None,
+    concurrency: int = 4096,
+    rate: float = 5000.0,
+    timeout: float = 0.5,
+) -> dict:
+    """Connect-probe the fleet's address range with the discovery sweep."""
+    cidr: str = fleet.cidr
+
+    start: float = time.perf_counter()
+    found = discover_hosts(
+        cidrs=[cidr],
+        ports=[fleet.port],
+        concurrency=concurrency,
+        rate=rate,
+        timeout=timeout,
+    )
+    elapsed: float = time.perf_counter() - start
+
+    probes: int = sum(1 for _ in ipaddress.ip_network(cidr).hosts())
+    ## Unused addresses in the range refuse connections, only count the fleet's
+    alive: set[str] = {host.host for host in found if host.host in fleet.kinds}
+    open_hosts: set[str] = {host.host for host in found if host.open_ports}
+    expected_open: set[str] = set(fleet.hosts(HOST_OK, HOST_SLOW))
+
+    return {
+        "cidr": cidr,
+        "probes": probes,
+        "seconds": round(elapsed, 3),
+        "probes_per_second": round(probes / max(elapsed, 1e-9), 1),
+        "alive": len(alive),
+        "open": len(open_hosts),
+        "missed_open": len(expected_open - open_hosts),
+        "missed_alive": len(set(fleet.hosts(HOST_REFUSED)) - alive),
+        "unexpected_open": len(open_hosts - expected_open),
+    }
+
+
+def run_pipeline_scenario(
+    fleet: SimulatedFleet = None,
+    inventory: SaltInventory = None,
+    output_root: Path = None,
+    concurrency: dict[str, int] | None = None,
+    timeout: float = 0.5,
+) -> dict:
+    """Stream the inventory through validate -> probe -> render -> persist."""
+    inventory_dir: Path = Path(f"{output_root}/inventory")
+    inventory_dir.mkdir(parents=True, exist_ok=True)
+
+    with open(f"{inventory_dir}/master.json", "w") as f:
+        json.dump(inventory.master.cached_dump(), f)
+    inventory.save_minions(f"{inventory_dir}/minions.json")
+
+    prober: AdaptiveProber = _prober(fleet, timeout)
+    stats: ProbeStats = fleet.reset_stats()
+
+    start: float = time.perf_counter()
+    pipeline, _ = run_inventory_pipeline(
+        inventory=SaltInventory(
+            source=JSONInventorySource(inventory_dir=inventory_dir)
+        ),
+        template_env=get_loader_env(
+            loader=load_template_dir(
+                templates_dir=f"{TEMPLATES_DIR}/scripts/setup/linux"
+            )
+        ),
+        prober=prober,
+        output_file=f"{output_root}/inventory.parquet",
+        output_root=f"{output_root}/scripts",
+        concurrency=concurrency,
+    )
+    elapsed: float = time.perf_counter() - start
+
+    return {
+        "seconds": round(elapsed, 3),
+        "minions_per_second": round(len(inventory.minions) / max(elapsed, 1e-9), 1),
+        "retries": prober.budget.spent,
+        "unreachable": len(pipeline.dropped.get("probe", [])),
+        "probes": stats.summary(),
+        "stages": [stage.as_dict() for stage in pipeline.stats],
+    }
+
+
+def run_benchmark(
+    count: int = 1000,
+    profile: FleetProfile | None = None,
+    scenarios: list[str] | None = None,
+    network: str = "127.64.0.0/16",
+    port: int = 20022,
+    workers: int = 64,
+    concurrency: int = 4096,
+    rate: float = 5000.0,
+    timeout: float = 0.5,
+    seed: int = 0,
+) -> dict:
+    scenarios = scenarios or SCENARIOS
+    unknown: list[str] = [s for s in scenarios if s not in SCENARIOS]
+    if unknown:
+        raise ValueError(f"Unknown scenario(s): {unknown}. Expected one of {SCENARIOS}")
+
+    fleet: SimulatedFleet = SimulatedFleet(
+        count=count, profile=profile, network=network, port=port, seed=seed
+    )
+    inventory: SaltInventory = synthetic_inventory(fleet)
+    results: dict = {
+        "hosts": {
+            kind: len(fleet.hosts(kind))
+            for kind in (HOST_OK, HOST_SLOW, HOST_REFUSED, HOST_BLACKHOLE)
+        },
+        "profile": fleet.profile.__dict__,
+    }
+
+    with fleet, tempfile.TemporaryDirectory() as tmp:
+        for scenario in scenarios:
+            log.info(f"Running [{scenario}] scenario against {count} simulated host(s)")
+
+            match scenario:
+                case "probe":
+                    results[scenario] = run_probe_scenario(
+                        fleet=fleet,
+                        inventory=inventory,
+                        workers=workers,
+                        timeout=timeout,
+                    )
+                case "sweep":
+                    results[scenario] = run_sweep_scenario(
+                        fleet=fleet, concurrency=concurrency, rate=rate, timeout=timeout
+                    )
+                case "pipeline":
+                    results[scenario] = run_pipeline_scenario(
+                        fleet=fleet,
+                        inventory=inventory,
+                        output_root=Path(tmp),
+                        concurrency={"probe": workers},
+                        timeout=timeout,
+                    )
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Load-test probing, discovery & the inventory pipeline against a simulated fleet"
+    )
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument(
+        "--scenario",
+        dest="scenarios",
+        action="append",
+        choices=SCENARIOS,
+        default=None,
+        help="Scenario to run (repeatable, default: all)",
+    )
+    parser.add_argument("--network", default="127.64.0.0/16")
+    parser.add_argument("--port", type=int, default=20022)
+    parser.add_argument("--workers", type=int, default=64, help="Probe threads")
+    parser.add_argument(
+        "--concurrency", type=int, default=4096, help="Sweep probes in flight"
+    )
+    parser.add_argument("--rate", type=float, default=5000.0, help="Sweep probes/sec")
+    parser.add_argument("--timeout", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=0)
+
+    defaults: FleetProfile = FleetProfile()
+    for name, value in defaults.__dict__.items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=float, default=value)
+
+    args = parser.parse_args()
+
+    log.remove()
+    log.add(sys.stderr, level="WARNING")
+
+    print(
+        json.dumps(
+            run_benchmark(
+                count=args.count,
+                profile=FleetProfile(
+                    **{name: getattr(args, name) for name in defaults.__dict__}
+                ),
+                scenarios=args.scenarios,
+                network=args.network,
+                port=args.port,
+                workers=args.workers,
+                concurrency=args.concurrency,
+                rate=args.rate,
+                timeout=args.timeout,
+                seed=args.seed,
+            ),
+            indent=2,
+        )
+    )
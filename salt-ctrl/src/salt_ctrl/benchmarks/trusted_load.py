@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+if __name__ == "__main__":
+    import sys
+
+    sys.path.append(".")
+
+import argparse
+import json
+
+from pathlib import Path
+import tempfile
+import time
+
+from salt_ctrl.domain.inventory import (
+    SaltInventory,
+    SaltMaster,
+    SaltMinion,
+    SnapshotInventorySource,
+    TrustedChecksums,
+)
+
+from loguru import logger as log
+
+
+def synthetic_inventory(count: int = 10_000) -> SaltInventory:
+    """Build a SaltInventory with `count` fake minions."""
+    return SaltInventory(
+        master=SaltMaster(
+            name="master1", host="10.0.0.1", os_type="linux", distro="ubuntu"
+        ),
+        minions=[
+            SaltMinion(
+                name=f"minion{i}",
+                host=f"10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}",
+                os_type="linux" if i % 10 else "windows",
+                distro=["ubuntu", "debian", "fedora"][i % 3] if i % 10 else "win11",
+            )
+            for i in range(count)
+        ],
+    )
+
+
+def timed_load(snapshot: Path, trust_store: TrustedChecksums | None) -> float:
+    inventory: SaltInventory = SaltInventory(
+        source=SnapshotInventorySource(path=snapshot), trust_store=trust_store
+    )
+
+    start: float = time.perf_counter()
+    loaded: bool = inventory.refresh()
+    elapsed: float = time.perf_counter() - start
+
+    if not loaded:
+        raise RuntimeError(f"Failed loading snapshot {snapshot}")
+
+    return elapsed
+
+
+def run_benchmark(count: int = 100_000, repeat: int = 5) -> dict[str, float]:
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot: Path = Path(f"{tmp}/inventory.json")
+        trust_store: TrustedChecksums = TrustedChecksums(
+            path=Path(f"{tmp}/trusted.json")
+        )
+
+        synthetic_inventory(count).model_copy(
+            update={"trust_store": trust_store}
+        ).save_snapshot(snapshot)
+
+        validated: float = min(timed_load(snapshot, None) for _ in range(repeat))
+        trusted: float = min(
+            timed_load(snapshot, TrustedChecksums(path=trust_store.path))
+            for _ in range(repeat)
+        )
+
+    return {
+        "minions": count,
+        "validated_seconds": round(validated, 4),
+        "trusted_seconds": round(trusted, 4),
+        "speedup": round(validated / trusted, 2),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark trusted snapshot loads")
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    log.remove()
+    log.add(sys.stderr, level="WARNING")
+
+    print(json.dumps(run_benchmark(count=args.count, repeat=args.repeat), indent=2))
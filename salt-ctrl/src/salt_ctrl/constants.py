@@ -4,14 +4,23 @@ from pathlib import Path
 
 DATA_DIR: Path = Path(".data")
 PQ_DIR: Path = Path(f"{DATA_DIR}/parquet")
+REACHABILITY_DIR: Path = Path(f"{DATA_DIR}/reachability")
+DAEMON_SOCKET: Path = Path(f"{DATA_DIR}/salt-ctrl.sock")
+SNAPSHOT_DIR: Path = Path(f"{DATA_DIR}/snapshots")
+SNAPSHOT_FILE: Path = Path(f"{SNAPSHOT_DIR}/inventory.json")
+TRUSTED_CHECKSUMS_FILE: Path = Path(f"{SNAPSHOT_DIR}/trusted.json")
 
 TEMPLATES_DIR: Path = Path("templates")
 TEMPLATE_OUTPUT_DIR: Path = Path("output/templates")
 INVENTORY_DIR: Path = Path("inventory")
 MINIONS_FILE: Path = Path(f"{INVENTORY_DIR}/minions.json")
 MASTERS_FILE: Path = Path(f"{INVENTORY_DIR}/masters.json")
+## Optional /etc/hosts-style overrides for inventory hostnames
+HOSTS_FILE: Path = Path(f"{INVENTORY_DIR}/hosts")
 
 SALT_FW_PORTS: list[int] = [4505, 4506]
+## Ports probed by subnet discovery: SSH & the Salt publish/return ports
+DISCOVERY_PORTS: list[int] = [22, *SALT_FW_PORTS]
 
 SCRIPT_TEMPLATES_DIR: Path = Path(f"{TEMPLATES_DIR}/scripts")
 SCRIPT_OUTPUT_DIR: Path = Path(f"output/scripts")
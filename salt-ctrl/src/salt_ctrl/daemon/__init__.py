@@ -0,0 +1,3 @@
+from __future__ import annotations
+
+from .client import daemon_running, send_request
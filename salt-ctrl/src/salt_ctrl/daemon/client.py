@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import json
+import socket
+
+from pathlib import Path
+from typing import Union
+
+from salt_ctrl.constants import DAEMON_SOCKET
+
+## Keep this module free of heavy imports (pandas, pydantic, Dynaconf), it is
+#  imported by every CLI invocation.
+
+
+def daemon_running(socket_path: Union[Path, str] = DAEMON_SOCKET) -> bool:
+    """Check if a salt-ctrl daemon is accepting connections on socket_path."""
+    if not Path(socket_path).exists():
+        return False
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(str(socket_path))
+    except OSError:
+        return False
+
+    return True
+
+
+def send_request(
+    request: dict = None,
+    socket_path: Union[Path, str] = DAEMON_SOCKET,
+    timeout: float | None = 300.0,
+) -> dict:
+    """Send a request to the salt-ctrl daemon & return its response.
+
+    Requests & responses are single lines of JSON. Responses are dicts with a
+    'success' bool and a 'detail' value.
+    """
+    if request is None:
+        raise ValueError("Missing request to send to daemon")
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(socket_path))
+        sock.sendall(json.dumps(request).encode() + b"\n")
+
+        with sock.makefile("rb") as f:
+            line: bytes = f.readline()
+
+    if not line:
+        raise ConnectionError(f"Daemon at {socket_path} closed the connection")
+
+    return json.loads(line)
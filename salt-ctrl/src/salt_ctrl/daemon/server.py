@@ -0,0 +1,315 @@
+from __future__ import annotations
+
+import json
+import os
+
+from pathlib import Path
+import socketserver
+import threading
+import time
+from typing import Union
+
+from salt_ctrl.constants import DAEMON_SOCKET, TEMPLATES_DIR
+from salt_ctrl.domain.inventory import SaltInventory
+from salt_ctrl.domain.inventory.sources import (
+    InventorySourceBase,
+    JSONInventorySource,
+)
+from salt_ctrl.domain.reachability import ReachabilityHistory
+from salt_ctrl.utils.jinja_utils import get_loader_env, load_template_dir
+from salt_ctrl.utils.net_utils import (
+    AdaptiveProber,
+    HostResolver,
+    RetryBudget,
+    RttEstimator,
+)
+from salt_ctrl.utils.salt_inventory_utils import render_inventory_scripts
+
+from jinja2 import Environment
+from loguru import logger as log
+
+from .client import daemon_running
+
+
+class InventoryState:
+    """Inventory, indexes, templates & probe cache shared between requests.
+
+    Used by the daemon to keep everything hot in memory, and by the CLI directly
+    when no daemon is running. Every request polls the inventory source, which is a
+    cheap stat() call unless the inventory changed on disk. Hosts are resolved
+    concurrently on every reload; unresolvable hosts are kept in self.unresolved.
+
+    Probe results are recorded to a ReachabilityHistory (default: under
+    REACHABILITY_DIR), pass record_history=False to not keep them.
+    """
+
+    def __init__(
+        self,
+        source: InventorySourceBase | None = None,
+        templates_dir: Union[Path, str] = f"{TEMPLATES_DIR}/scripts/setup/linux",
+        probe_ttl: float = 30.0,
+        history: ReachabilityHistory | None = None,
+        resolver: HostResolver | None = None,
+        prober: AdaptiveProber | None = None,
+        record_history: bool = True,
+    ):
+        self.inventory: SaltInventory = SaltInventory(
+            source=source or JSONInventorySource()
+        )
+        self.templates_dir: Path = Path(templates_dir)
+        self.probe_ttl: float = probe_ttl
+        if history is None and record_history:
+            history = ReachabilityHistory()
+        self.history: ReachabilityHistory | None = history
+        self.resolver: HostResolver = resolver or HostResolver()
+        self.unresolved: list[str] = []
+        self._prober: AdaptiveProber | None = prober
+
+        self.by_name: dict = {}
+        self._template_env: Environment | None = None
+        self._probe_cache: dict[str, tuple[float, bool]] = {}
+        self._lock: threading.RLock = threading.RLock()
+
+    @property
+    def template_env(self) -> Environment:
+        if self._template_env is None:
+            self._template_env = get_loader_env(
+                loader=load_template_dir(templates_dir=self.templates_dir)
+            )
+
+        return self._template_env
+
+    @property
+    def prober(self) -> AdaptiveProber:
+        ## Created on first use, seeding probe timeouts from RTTs in the history
+        #  (if there is one) reads Parquet partitions
+        if self._prober is None:
+            self._prober = AdaptiveProber(
+                estimator=(
+                    self.history.rtt_estimator()
+                    if self.history is not None
+                    else RttEstimator()
+                )
+            )
+
+        return self._prober
+
+    def refresh(self, force: bool = False) -> bool:
+        """Reload the inventory if its source changed, rebuilding indexes."""
+        with self._lock:
+            if not self.inventory.refresh(force=force):
+                return False
+
+            nodes = [self.inventory.master] + self.inventory.minions
+
+            self.by_name = {node.name: node for node in nodes}
+            self._probe_cache.clear()
+
+            self.resolver.invalidate()
+            addresses = self.inventory.resolve(resolver=self.resolver)
+            self.unresolved = [host for host, addr in addresses.items() if addr is None]
+
+            return True
+
+    def query(
+        self,
+        name: str | None = None,
+        os_type: str | None = None,
+        distro: str | None = None,
+        salt_type: str | None = None,
+    ) -> list[dict]:
+        self.refresh()
+
+        if name is not None:
+            nodes = [self.by_name[name]] if name in self.by_name else []
+        else:
+            nodes = list(self.by_name.values())
+
+        results: list[dict] = []
+
+        for node in nodes:
+            _type: str = "master" if node is self.inventory.master else "minion"
+
+            if os_type is not None and node.os_type != os_type:
+                continue
+            if distro is not None and node.distro != distro:
+                continue
+            if salt_type is not None and _type != salt_type:
+                continue
+
+            results.append({**node.cached_dump(), "salt_type": _type})
+
+        return results
+
+    def probe(
+        self, names: list[str] | None = None, record_history: bool = True
+    ) -> dict[str, bool]:
+        """Check reachability of nodes, reusing results younger than probe_ttl.
+
+        Pass record_history=False to not record this request's probes to the history.
+        """
+        self.refresh()
+
+        names = names or list(self.by_name.keys())
+        results: dict[str, bool] = {}
+
+        ## Requests are handled concurrently, give each its own retry budget
+        budget: RetryBudget = self.prober.retry.budget(len(names))
+
+        for name in names:
+            if name not in self.by_name:
+                raise KeyError(f"Unknown inventory node: {name}")
+
+            node = self.by_name[name]
+            cached = self._probe_cache.get(node.host, None)
+
+            if cached is not None and time.monotonic() - cached[0] < self.probe_ttl:
+                results[name] = cached[1]
+
+                continue
+
+            up: bool = node.reachable(
+                history=self.history if record_history else None,
+                spinner=False,
+                resolver=self.resolver,
+                prober=self.prober,
+                budget=budget,
+            )
+            self._probe_cache[node.host] = (time.monotonic(), up)
+            results[name] = up
+
+        return results
+
+    def render(self) -> bool:
+        """Render scripts for nodes that changed since the last render request."""
+        self.refresh()
+
+        return render_inventory_scripts(
+            inventory=self.inventory,
+            template_env=self.template_env,
+            resolver=self.resolver,
+            only_changed=True,
+        )
+
+    def resolve(self, names: list[str] | None = None) -> dict[str, str | None]:
+        """Resolve nodes' hosts (from cache when fresh), returning {name: address}."""
+        self.refresh()
+
+        names = names or list(self.by_name.keys())
+        unknown: list[str] = [name for name in names if name not in self.by_name]
+        if unknown:
+            raise KeyError(f"Unknown inventory node(s): {unknown}")
+
+        addresses = self.resolver.resolve_many(
+            [self.by_name[name].host for name in names]
+        )
+
+        return {name: addresses[self.by_name[name].host] for name in names}
+
+    def export(self, **kwargs) -> str:
+        """Stream the inventory to a Parquet/Arrow IPC file, see SaltInventory.export()."""
+        self.refresh()
+
+        return str(self.inventory.export(**kwargs))
+
+    def handle(self, request: dict = None) -> dict:
+        """Dispatch a request dict to a command, returning a response dict."""
+        if request is None:
+            raise ValueError("Missing request")
+
+        cmd: str | None = request.get("cmd", None)
+        args: dict = request.get("args", {}) or {}
+
+        handlers: dict = {
+            "ping": lambda: "pong",
+            "reload": lambda: self.refresh(force=True),
+            "query": lambda: self.query(**args),
+            "probe": lambda: self.probe(**args),
+            "resolve": lambda: self.resolve(**args),
+            "render": lambda: self.render(),
+            "export": lambda: self.export(**args),
+        }
+
+        if cmd not in handlers:
+            return {"success": False, "detail": f"Unknown command: {cmd}"}
+
+        try:
+            return {"success": True, "detail": handlers[cmd]()}
+        except Exception as exc:
+            msg = Exception(f"Unhandled exception handling [{cmd}]. Details: {exc}")
+            log.error(msg)
+
+            return {"success": False, "detail": str(msg)}
+
+
+class InventoryRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request: dict = json.loads(line)
+            except json.JSONDecodeError as exc:
+                response: dict = {"success": False, "detail": f"Invalid JSON: {exc}"}
+            else:
+                if request.get("cmd", None) == "shutdown":
+                    response = {"success": True, "detail": "shutting down"}
+                    threading.Thread(target=self.server.shutdown).start()
+                else:
+                    response = self.server.state.handle(request)
+
+            self.wfile.write(json.dumps(response, default=str).encode() + b"\n")
+            self.wfile.flush()
+
+
+class InventoryDaemon(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        state: InventoryState = None,
+        socket_path: Union[Path, str] = DAEMON_SOCKET,
+    ):
+        if state is None:
+            raise ValueError("Missing InventoryState for daemon")
+
+        self.state: InventoryState = state
+        self.socket_path: Path = Path(socket_path)
+
+        if self.socket_path.exists():
+            if daemon_running(self.socket_path):
+                raise RuntimeError(f"A daemon is already running on {socket_path}")
+
+            log.warning(f"Removing stale daemon socket {self.socket_path}")
+            self.socket_path.unlink()
+
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+
+        super().__init__(str(self.socket_path), InventoryRequestHandler)
+
+    def server_close(self):
+        super().server_close()
+
+        if self.socket_path.exists():
+            os.unlink(self.socket_path)
+
+
+def serve(
+    state: InventoryState | None = None, socket_path: Union[Path, str] = DAEMON_SOCKET
+) -> None:
+    """Warm up inventory & templates, then serve requests until shut down."""
+    state = state or InventoryState()
+
+    state.refresh(force=True)
+    ## Compile templates up front so the first render request is fast
+    for template_name in state.template_env.list_templates():
+        state.template_env.get_template(template_name)
+
+    with InventoryDaemon(state=state, socket_path=socket_path) as daemon:
+        log.info(f"salt-ctrl daemon listening on {socket_path}")
+
+        try:
+            daemon.serve_forever()
+        except KeyboardInterrupt:
+            log.info("salt-ctrl daemon interrupted, shutting down")
+        finally:
+            if state.history is not None:
+                state.history.close()
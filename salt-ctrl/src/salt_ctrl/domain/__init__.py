@@ -1,3 +1,3 @@
 from __future__ import annotations
 
-from . import inventory
+from . import inventory, reachability
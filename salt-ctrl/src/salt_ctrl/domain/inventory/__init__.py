@@ -1,3 +1,14 @@
 from __future__ import annotations
 
+from .export import InventoryExportWriter, set_inventory_dtypes
 from .schemas import SaltInventory, SaltMaster, SaltMinion
+from .sources import (
+    DynaconfInventorySource,
+    HTTPInventorySource,
+    InventoryPayload,
+    JSONInventorySource,
+    ParquetInventorySource,
+    SnapshotInventorySource,
+    serve_inventory,
+)
+from .trust import TrustedChecksums
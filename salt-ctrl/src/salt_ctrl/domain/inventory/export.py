@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+from pathlib import Path
+import threading
+from typing import Iterable, Union
+
+from loguru import logger as log
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+## Low-cardinality inventory columns, stored as pandas categoricals
+INVENTORY_CATEGORICAL_COLUMNS: list[str] = ["os_type", "distro", "salt_type"]
+## High-cardinality string columns, stored as Arrow-backed strings
+INVENTORY_STRING_COLUMNS: list[str] = ["name", "host"]
+
+EXPORT_FORMATS: list[str] = ["parquet", "ipc"]
+
+
+def inventory_columns(include_serialized: bool = True) -> list[str]:
+    columns: list[str] = [
+        "name",
+        "host",
+        "os_type",
+        "distro",
+        "salt_type",
+    ]
+
+    if include_serialized:
+        columns.append("serialized")
+
+    return columns
+
+
+def set_inventory_dtypes(df: pd.DataFrame = None) -> pd.DataFrame:
+    """Set compact dtypes on an inventory DataFrame.
+
+    os_type, distro & salt_type repeat a handful of values across every row & are
+    stored as categoricals. name & host are stored as Arrow strings, and the
+    msgpack 'serialized' column (if present) as Arrow binary instead of one Python
+    bytes object per row.
+    """
+    if df is None:
+        raise ValueError("Missing inventory DataFrame")
+
+    dtypes: dict = {}
+
+    for col in INVENTORY_STRING_COLUMNS:
+        if col in df.columns:
+            dtypes[col] = pd.ArrowDtype(pa.string())
+
+    for col in INVENTORY_CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            dtypes[col] = "category"
+
+    if "serialized" in df.columns:
+        dtypes["serialized"] = pd.ArrowDtype(pa.binary())
+
+    return df.astype(dtypes)
+
+
+def inventory_arrow_schema(include_serialized: bool = True) -> pa.Schema:
+    """Arrow schema of an inventory DataFrame with set_inventory_dtypes() applied.
+
+    pandas picks the categorical code width (int8, int16...) from each chunk's
+    number of categories. The schema uses int32 indices for every chunk, so
+    chunks with more than 127 distinct values can still be written.
+    """
+    types: dict[str, pa.DataType] = {
+        **{col: pa.string() for col in INVENTORY_STRING_COLUMNS},
+        **{
+            col: pa.dictionary(pa.int32(), pa.string())
+            for col in INVENTORY_CATEGORICAL_COLUMNS
+        },
+        "serialized": pa.binary(),
+    }
+
+    return pa.schema(
+        [(col, types[col]) for col in inventory_columns(include_serialized)]
+    )
+
+
+class InventoryExportWriter:
+    """Write inventory rows to a Parquet or Arrow IPC file in fixed-size chunks.
+
+    Rows are buffered until chunk_size rows are waiting, then written as one or more
+    Parquet row groups (of at most row_group_size rows) or as an Arrow IPC record
+    batch. Memory is bounded by chunk_size, regardless of the inventory's size.
+
+    The file has the same columns & (restored) dtypes as SaltInventory.df() written
+    with to_parquet(); categorical columns always use int32 indices. IPC files
+    use the streaming format, which allows each batch to carry its own dictionary
+    for the categorical columns; read them with pyarrow.ipc.open_stream().
+    """
+
+    def __init__(
+        self,
+        path: Union[Path, str] = None,
+        format: str = "parquet",
+        chunk_size: int = 10_000,
+        row_group_size: int | None = None,
+        include_serialized: bool = True,
+    ):
+        if path is None:
+            raise ValueError("Missing export output path")
+        if format not in EXPORT_FORMATS:
+            raise ValueError(
+                f"Invalid export format: {format}. Must be one of {EXPORT_FORMATS}"
+            )
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+
+        self.path: Path = Path(path)
+        self.format: str = format
+        self.chunk_size: int = chunk_size
+        self.row_group_size: int = row_group_size or chunk_size
+        self.include_serialized: bool = include_serialized
+        self.schema: pa.Schema = inventory_arrow_schema(include_serialized)
+        self.rows_written: int = 0
+
+        self._buffer: list[dict] = []
+        self._writer = None
+        self._sink = None
+        self._closed: bool = False
+        self._lock: threading.Lock = threading.Lock()
+
+    def __enter__(self) -> InventoryExportWriter:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _open(self, schema: pa.Schema) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        match self.format:
+            case "parquet":
+                self._writer = pq.ParquetWriter(str(self.path), schema)
+            case "ipc":
+                self._sink = pa.OSFile(str(self.path), "wb")
+                self._writer = pa.ipc.new_stream(self._sink, schema)
+
+    def write(self, row: dict = None) -> None:
+        """Buffer a row (a dumped inventory object + salt_type & serialized)."""
+        with self._lock:
+            self._buffer.append(row)
+
+            if len(self._buffer) >= self.chunk_size:
+                self._flush()
+
+    def write_rows(self, rows: Iterable[dict] = None) -> None:
+        for row in rows:
+            self.write(row)
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._buffer:
+            return
+
+        chunk: pd.DataFrame = set_inventory_dtypes(
+            pd.DataFrame(
+                self._buffer, columns=inventory_columns(self.include_serialized)
+            )
+        )
+        self._buffer = []
+
+        table: pa.Table = pa.Table.from_pandas(
+            chunk, schema=self.schema, preserve_index=False
+        )
+
+        if self._writer is None:
+            ## Keep the pandas metadata from the first chunk, so readers restore dtypes
+            self._open(table.schema)
+
+        match self.format:
+            case "parquet":
+                self._writer.write_table(table, row_group_size=self.row_group_size)
+            case "ipc":
+                for batch in table.to_batches():
+                    self._writer.write_batch(batch)
+
+        self.rows_written += table.num_rows
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+
+            self._flush()
+
+            if self._writer is None:
+                ## Nothing written, still produce a valid (empty) file
+                self._open(self.schema)
+
+            self._writer.close()
+
+            if self._sink is not None:
+                self._sink.close()
+
+            self._closed = True
+
+        log.debug(f"Exported [{self.rows_written}] inventory row(s) to {self.path}")
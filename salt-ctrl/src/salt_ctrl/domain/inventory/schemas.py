@@ -1,15 +1,42 @@
 from __future__ import annotations
 
 import json
+import os
 
 from pathlib import Path
-from typing import Union
+import time
+from typing import TYPE_CHECKING, Callable, Iterable, NamedTuple, Union
 
-from salt_ctrl.constants import INVENTORY_DIR, PQ_DIR
-from salt_ctrl.utils.net_utils import ping
+from salt_ctrl.constants import INVENTORY_DIR, PQ_DIR, SNAPSHOT_FILE
+from salt_ctrl.utils.net_utils import ping_rtt
+
+## Import class definitions for editor type hinting, without fully importing the module
+if TYPE_CHECKING:
+    from salt_ctrl.domain.reachability import ReachabilityHistory
+    from salt_ctrl.utils.net_utils import AdaptiveProber, HostResolver, RetryBudget
+
+from .export import (
+    InventoryExportWriter,
+    inventory_columns,
+    set_inventory_dtypes,
+)
+from .sources import (
+    InventoryPayload,
+    InventorySourceBase,
+    JSONInventorySource,
+    SnapshotInventorySource,
+)
+from .trust import TrustedChecksums
 
 from loguru import logger as log
-from pydantic import BaseModel, Field, ValidationError, field_validator
+from pydantic import (
+    AliasChoices,
+    BaseModel,
+    Field,
+    PrivateAttr,
+    ValidationError,
+    field_validator,
+)
 from red_utils.ext.context_managers.cli_spinners import SimpleSpinner
 from red_utils.ext.msgpack_utils import (
     msgpack_serialize,
@@ -23,10 +50,100 @@ from red_utils.std.hash_utils import get_hash_from_str
 import pandas as pd
 
 
+class _Memo(NamedTuple):
+    """Memoized encodings of an inventory object, valid for one revision."""
+
+    revision: int = 0
+    dump: dict | None = None
+    json: str | None = None
+    msgpack: bytes | None = None
+
+
+_EMPTY_MEMO: _Memo = _Memo()
+
+
 class SaltInventoryBase(BaseModel):
     inventory_dir: Path = Field(default=INVENTORY_DIR)
     master: "SaltMaster" = Field(default=None)
     minions: list["SaltMinion"] = Field(default=None)
+    source: InventorySourceBase | None = Field(default=None)
+    trust_store: TrustedChecksums | None = Field(default=None)
+
+    _loaded_trusted: bool = PrivateAttr(default=False)
+    ## artefact -> {id(node): (node, revision)} as of the artefact's last build
+    _built: dict[str, dict[int, tuple]] = PrivateAttr(default_factory=dict)
+    _df_cache: dict[bool, pd.DataFrame] = PrivateAttr(default_factory=dict)
+
+    @property
+    def loaded_trusted(self) -> bool:
+        """True if the last load_payload() skipped validation for a trusted checksum."""
+        return self._loaded_trusted
+
+    @property
+    def nodes(self) -> list[SaltInventoryObjectBase]:
+        """The master (if loaded) followed by every minion."""
+        return ([self.master] if self.master is not None else []) + (self.minions or [])
+
+    def revisions(self) -> dict[int, tuple]:
+        """Snapshot of every node's revision, to pass to mark_clean() after a build."""
+        return {id(node): (node, node.revision) for node in self.nodes}
+
+    def dirty(self, artefact: str = None) -> list[SaltInventoryObjectBase]:
+        """Nodes added or changed since artefact (i.e. "df") was last marked clean.
+
+        Every node is dirty for an artefact that was never built. Removed nodes are not
+        returned; use is_stale() to also detect removals.
+        """
+        if artefact is None:
+            raise ValueError("Missing artefact name")
+
+        built: dict[int, tuple] | None = self._built.get(artefact, None)
+        if built is None:
+            return self.nodes
+
+        dirty: list[SaltInventoryObjectBase] = []
+
+        for node in self.nodes:
+            entry: tuple | None = built.get(id(node), None)
+
+            ## Compare identity too, ids of garbage-collected nodes can be reused
+            if entry is None or entry[0] is not node or entry[1] != node.revision:
+                dirty.append(node)
+
+        return dirty
+
+    def is_stale(self, artefact: str = None) -> bool:
+        """Check if nodes were added, changed, removed or moved since the last build.
+
+        Artefacts listing every node (i.e. df(), snapshots) depend on the node order, so
+        an in-place reorder (i.e. minions.reverse()) also makes them stale.
+        """
+        built: dict[int, tuple] | None = self._built.get(artefact, None)
+        nodes: list[SaltInventoryObjectBase] = self.nodes
+
+        if built is None or len(built) != len(nodes):
+            return True
+
+        ## revisions() is built in node order, compare it to the current order
+        return any(
+            entry[0] is not node or entry[1] != node.revision
+            for entry, node in zip(built.values(), nodes)
+        )
+
+    def mark_clean(
+        self,
+        artefact: str = None,
+        revisions: dict[int, tuple] | None = None,
+    ) -> None:
+        """Record artefact as built from the current nodes.
+
+        Pass revisions (from revisions(), taken before the build started) so changes
+        made during the build still count as dirty.
+        """
+        if artefact is None:
+            raise ValueError("Missing artefact name")
+
+        self._built[artefact] = revisions or self.revisions()
 
     @property
     def master_file(self) -> Path:
@@ -134,11 +251,228 @@ class SaltInventoryBase(BaseModel):
 
         return True
 
-    def master_df(self) -> pd.DataFrame:
+    def load_payload(self, payload: InventoryPayload = None) -> bool:
+        """Validate raw inventory data from an inventory source & load it.
+
+        The inventory is only updated if the master and every minion validate.
+
+        When a trust_store is set and the payload's checksum was trusted for its source
+        by an earlier load, objects are constructed without re-validation. Otherwise the
+        payload is fully validated, and its checksum is trusted if the data was already in
+        canonical form (i.e. a snapshot written by save_snapshot()), so constructing
+        it directly produces identical objects.
+        """
+        if payload is None:
+            raise ValueError("Missing InventoryPayload to load")
+
+        trusted: bool = (
+            self.trust_store is not None
+            and payload.master is not None
+            and self.trust_store.is_trusted(payload.checksum, payload.source_id)
+        )
+
+        try:
+            if trusted:
+                master: SaltMaster = _construct_trusted(SaltMaster, payload.master)
+                minions: list[SaltMinion] = [
+                    _construct_trusted(SaltMinion, _minion)
+                    for _minion in payload.minions
+                ]
+            else:
+                master: SaltMaster = SaltMaster.model_validate(payload.master)
+                minions: list[SaltMinion] = [
+                    SaltMinion.model_validate(_minion) for _minion in payload.minions
+                ]
+        except Exception as exc:
+            log.error(
+                Exception(
+                    f"Unhandled exception validating inventory payload. Details: {exc}"
+                )
+            )
+
+            return False
+
+        if (
+            not trusted
+            and self.trust_store is not None
+            and payload.checksum
+            and payload.source_id
+            and master.model_dump() == payload.master
+            and all(
+                minion.model_dump() == _minion
+                for minion, _minion in zip(minions, payload.minions)
+            )
+        ):
+            self.trust_store.trust(payload.checksum, payload.source_id)
+
+        ## Keep unchanged objects across reloads, with their memoized encodings, so
+        #  they aren't dirty for derived artefacts
+        if self.master is not None and self.master.__dict__ == master.__dict__:
+            master = self.master
+        if self.minions:
+            previous: dict[str, SaltMinion] = {m.name: m for m in self.minions}
+            minions = [
+                (
+                    previous[minion.name]
+                    if minion.name in previous
+                    and previous[minion.name].__dict__ == minion.__dict__
+                    else minion
+                )
+                for minion in minions
+            ]
+
+        self.master = master
+        self.minions = minions
+        self._loaded_trusted = trusted
+
+        log.info(
+            f"Loaded master [{master.name}] & [{len(minions)}] Salt minion(s) to Inventory{' (trusted, validation skipped)' if trusted else ''}."
+        )
+
+        return True
+
+    def save_snapshot(self, path: Union[Path, str] = SNAPSHOT_FILE) -> Path:
+        """Write the inventory to a JSON snapshot, readable by SnapshotInventorySource.
+
+        The snapshot is written from validated objects, so when a trust_store is set
+        its checksum is trusted right away and the next load skips validation. If no
+        node changed since the last snapshot to path, the file is left as is.
+        """
+        if self.master is None or self.minions is None:
+            raise ValueError("Inventory is not loaded, nothing to snapshot")
+
+        if isinstance(path, str):
+            path: Path = Path(path)
+
+        artefact: str = f"snapshot:{path.resolve()}"
+
+        if path.exists() and not self.is_stale(artefact):
+            log.debug(f"Inventory unchanged since last snapshot to {path}, skipping")
+
+            return path
+
+        revisions: dict[int, tuple] = self.revisions()
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file: Path = path.with_suffix(".tmp")
+
+        with open(tmp_file, "w") as f:
+            json.dump(
+                {
+                    "master": self.master.cached_dump(),
+                    "minions": [minion.cached_dump() for minion in self.minions],
+                },
+                f,
+            )
+
+        os.replace(tmp_file, path)
+        self.mark_clean(artefact, revisions=revisions)
+
+        if self.trust_store is not None:
+            snapshot: SnapshotInventorySource = SnapshotInventorySource(path=path)
+            self.trust_store.trust(snapshot.checksum(), snapshot.source_id)
+
+        log.info(f"Saved inventory snapshot to {path}")
+
+        return path
+
+    def merge_minions(self, minions: Iterable[SaltMinion] = None) -> list[SaltMinion]:
+        """Add minions to the inventory, skipping any whose host is already known.
+
+        A new minion whose name is taken by another host is renamed with a numeric
+        suffix. Returns the minions that were added.
+        """
+        if minions is None:
+            raise ValueError("Missing minions to merge")
+
+        if self.minions is None:
+            self.minions = []
+
+        known_nodes: list[SaltInventoryObjectBase] = self.minions + (
+            [self.master] if self.master is not None else []
+        )
+        hosts: set[str] = {node.host for node in known_nodes}
+        names: set[str] = {node.name for node in known_nodes}
+
+        added: list[SaltMinion] = []
+
+        for minion in minions:
+            if minion.host in hosts:
+                continue
+
+            name: str = minion.name
+            suffix: int = 1
+            while name in names:
+                suffix += 1
+                name = f"{minion.name}-{suffix}"
+
+            if name != minion.name:
+                minion = minion.model_copy(update={"name": name})
+
+            hosts.add(minion.host)
+            names.add(minion.name)
+            added.append(minion)
+
+        self.minions.extend(added)
+        log.debug(f"Merged [{len(added)}] new minion(s) into inventory")
+
+        return added
+
+    def save_minions(self, path: Union[Path, str, None] = None) -> Path:
+        """Write minions to minions.json (or path) in the inventory directory format."""
+        if self.minions is None:
+            raise ValueError("Inventory minions are not loaded, nothing to save")
+
+        path = Path(path) if path is not None else self.minions_file
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file: Path = path.with_suffix(".tmp")
+
+        with open(tmp_file, "w") as f:
+            json.dump([minion.cached_dump() for minion in self.minions], f, indent=4)
+
+        os.replace(tmp_file, path)
+        log.info(f"Saved [{len(self.minions)}] minion(s) to {path}")
+
+        return path
+
+    def refresh(self, force: bool = False) -> bool:
+        """Reload inventory from self.source, if the source has changed.
+
+        When no source is set, the JSON files in inventory_dir are used. Returns True
+        if the inventory was reloaded, and False if the source was unchanged or the
+        new data failed validation (in which case the current inventory is kept).
+        """
+        if self.source is None:
+            self.source = JSONInventorySource(inventory_dir=self.inventory_dir)
+
+        try:
+            payload: InventoryPayload | None = self.source.poll(force=force)
+        except Exception as exc:
+            log.error(
+                Exception(
+                    f"Unhandled exception polling inventory source [{self.source.source_id}]. Details: {exc}"
+                )
+            )
+
+            return False
+
+        if payload is None:
+            return False
+
+        if not self.load_payload(payload):
+            ## Make sure the next refresh retries the source
+            self.source.invalidate()
+
+            return False
+
+        return True
+
+    def master_df(self, include_serialized: bool = True) -> pd.DataFrame:
         """Compile a SaltMaster object to a DataFrame.
 
         Converts SaltMaster to a Python dict, then creates a DataFrame from
-        this dict.
+        this dict. Column dtypes are set by set_inventory_dtypes().
         """
         if self.master is None:
             log.warning(f"Inventory Salt master is None. Loading Salt master.")
@@ -146,44 +480,32 @@ class SaltInventoryBase(BaseModel):
 
         log.debug(f"Compiling Salt master to DataFrame")
 
-        dump_master: dict = self.master.model_dump()
-        dump_master["salt_type"] = "master"
-        dump_master["serialized"] = self.master.serialize()
+        dump_master: dict = self.master.as_row(include_serialized=include_serialized)
 
-        master_df: pd.DataFrame = pd.DataFrame.from_dict(dump_master, orient="index").T
-        # log.debug(f"Master DataFrame:\n{master_df}")
+        master_df: pd.DataFrame = set_inventory_dtypes(pd.DataFrame([dump_master]))
 
         return master_df
 
-    def minions_df(self) -> pd.DataFrame:
+    def minions_df(self, include_serialized: bool = True) -> pd.DataFrame:
         """Compile a list of SaltMinion objects to a single DataFrame.
 
         Function loops over SaltMinion objects in salt_minions, converting each to a Python
-        dict and appending "salt_type": "minion" to each object; a DataFrame is created from
-        this dict, then added to a temporary list.
-
-        Once looping through the list is complete, a single DataFrame is created by concatenating
-        each minion DataFrame.
+        dict with as_row(), which adds "salt_type": "minion". A single DataFrame is
+        created from the list of dicts, with column dtypes set by set_inventory_dtypes().
         """
         if self.minions is None:
             log.warning(f"Inventory Salt minions list is None. Loading Salt minions.")
             self.load_minions()
 
         log.debug(f"Compiling [{len(self.minions)}] Salt minion(s) to DataFrame")
-        minion_dfs: list[pd.DataFrame] = []
-
-        for minion in self.minions:
-            dump_minion: dict = minion.model_dump()
-            dump_minion["salt_type"] = "minion"
-            dump_minion["serialized"] = minion.serialize()
-            # log.debug(f"Minion dump ({type(dump_minion)}): {dump_minion}")
+        dump_minions: list[dict] = [
+            minion.as_row(include_serialized=include_serialized)
+            for minion in self.minions
+        ]
 
-            _df: pd.DataFrame = pd.DataFrame.from_dict(dump_minion, orient="index").T
-            # log.debug(f"Minion DataFrame:\n{_df}")
-            minion_dfs.append(_df)
-        log.debug(f"Compiled [{len(minion_dfs)}] minion DataFrame(s)")
-
-        minions_df: pd.DataFrame = pd.concat(minion_dfs)
+        minions_df: pd.DataFrame = set_inventory_dtypes(
+            pd.DataFrame(dump_minions, columns=inventory_columns(include_serialized))
+        )
         log.debug(f"Compiled [{minions_df.shape[0]}] Salt minions to single DataFrame")
 
         return minions_df
@@ -197,17 +519,105 @@ class SaltInventory(SaltInventoryBase):
         else:
             return len(self.minions)
 
-    def df(self, to_disk: bool = False, overwrite: bool = False) -> pd.DataFrame:
+    def resolve(self, resolver: HostResolver = None) -> dict[str, str | None]:
+        """Resolve the master's & every minion's host concurrently.
+
+        Returns {host: address or None}. Unresolvable hosts are logged as one warning.
+        """
+        if resolver is None:
+            raise ValueError("Missing HostResolver")
+
+        nodes: list[SaltInventoryObjectBase] = self.nodes
+        addresses: dict[str, str | None] = resolver.resolve_many(
+            [node.host for node in nodes]
+        )
+
+        unresolved: list[str] = [
+            node.name for node in nodes if addresses.get(node.host, None) is None
+        ]
+        if unresolved:
+            log.warning(f"[{len(unresolved)}] unresolvable host(s): {unresolved}")
+
+        return addresses
+
+    def sweep(
+        self,
+        history: ReachabilityHistory | None = None,
+        resolver: HostResolver | None = None,
+        prober: AdaptiveProber | None = None,
+    ) -> dict[str, bool]:
+        """Check reachability of the Salt master & every minion.
+
+        When a ReachabilityHistory is passed, each result is recorded and hosts that
+        have been dead for a while are probed last. When a HostResolver is passed, all
+        hosts are resolved concurrently before probing starts. When an AdaptiveProber
+        is passed, timeouts follow each host's observed RTT, and retries are capped by
+        a budget for the whole sweep.
+        """
+        nodes: list[SaltInventoryObjectBase] = self.nodes
+
+        if resolver is not None:
+            self.resolve(resolver=resolver)
+        if prober is not None:
+            prober.start_sweep(len(nodes))
+
+        if history is not None:
+            order: dict[str, int] = {
+                host: i
+                for i, host in enumerate(
+                    history.sweep_order(hosts=[n.host for n in nodes])
+                )
+            }
+            nodes = sorted(nodes, key=lambda n: order[n.host])
+
+        results: dict[str, bool] = {}
+
+        for node in nodes:
+            results[node.name] = node.reachable(
+                history=history, resolver=resolver, prober=prober
+            )
+            log.info(f"[{node.name}] reachable: {results[node.name]}")
+
+        return results
+
+    def df(
+        self,
+        to_disk: bool = False,
+        overwrite: bool = False,
+        include_serialized: bool = True,
+    ) -> pd.DataFrame:
         """Compile Salt master & minions to a single DataFrame.
 
         Optionally, save to a Parquet file by passing to_disk=True. If the
         DataFrame has already been saved, this function will skip saving the
-        Parquet file unless overwrite=True is passed.
+        Parquet file unless overwrite=True is passed. Pass include_serialized=False
+        to leave out the msgpack 'serialized' column.
+
+        The DataFrame is cached, and only rebuilt when a node was added, removed,
+        changed or moved since the last call. Unchanged nodes reuse their memoized rows.
         """
-        master_df: pd.DataFrame = self.master_df()
-        minions_df: pd.DataFrame = self.minions_df()
+        artefact: str = f"df:{include_serialized}"
 
-        inventory_df: pd.DataFrame = pd.concat([master_df, minions_df])
+        if include_serialized in self._df_cache and not self.is_stale(artefact):
+            log.debug("Inventory unchanged since last df() call, reusing DataFrame")
+            inventory_df: pd.DataFrame = self._df_cache[include_serialized].copy()
+        else:
+            revisions: dict[int, tuple] = self.revisions()
+
+            master_df: pd.DataFrame = self.master_df(
+                include_serialized=include_serialized
+            )
+            minions_df: pd.DataFrame = self.minions_df(
+                include_serialized=include_serialized
+            )
+
+            ## Categories differ between the 2 frames, re-apply dtypes after concatenating
+            inventory_df = set_inventory_dtypes(
+                pd.concat([master_df, minions_df], ignore_index=True)
+            )
+
+            self._df_cache[include_serialized] = inventory_df.copy()
+            self.mark_clean(artefact, revisions=revisions)
 
         if to_disk:
             output_file: Path = Path(f"{PQ_DIR}/inventory.parquet")
@@ -221,7 +631,7 @@ class SaltInventory(SaltInventoryBase):
                     log.info(f"Saving DataFrame to {output_file}")
 
                     try:
-                        inventory_df.to_parquet(path=output_file, engine="fastparquet")
+                        inventory_df.to_parquet(path=output_file, engine="pyarrow")
                     except Exception as exc:
                         msg = Exception(
                             f"Unhandled exception saving inventory DataFrame to file {output_file}. Details: {exc}"
@@ -232,7 +642,7 @@ class SaltInventory(SaltInventoryBase):
                 log.info(f"Saving DataFrame to {output_file}")
 
                 try:
-                    inventory_df.to_parquet(path=output_file, engine="fastparquet")
+                    inventory_df.to_parquet(path=output_file, engine="pyarrow")
                 except Exception as exc:
                     msg = Exception(
                         f"Unhandled exception saving inventory DataFrame to file {output_file}. Details: {exc}"
@@ -241,26 +651,127 @@ class SaltInventory(SaltInventoryBase):
 
         return inventory_df
 
+    def export(
+        self,
+        path: Union[Path, str, None] = None,
+        format: str = "parquet",
+        chunk_size: int = 10_000,
+        row_group_size: int | None = None,
+        include_serialized: bool = True,
+        minions: Iterable[SaltMinion] | None = None,
+    ) -> Path:
+        """Stream the inventory to a Parquet or Arrow IPC file in chunks.
+
+        Unlike df(to_disk=True), the full DataFrame is never built: minions are
+        converted & written chunk_size rows at a time, as Parquet row groups of at most
+        row_group_size rows or as Arrow IPC record batches. The file has df()'s columns
+        & values, but categorical columns always use int32 dictionary indices, while
+        df() narrows them to int8/int16. Pass minions to export from another iterable (i.e. a generator)
+        instead of self.minions.
+        """
+        if self.master is None:
+            raise ValueError("Inventory master is not loaded, nothing to export")
+
+        if minions is None:
+            minions = self.minions or []
+
+        if path is None:
+            path = (
+                f"{PQ_DIR}/inventory.parquet"
+                if format == "parquet"
+                else f"{PQ_DIR}/inventory.arrows"
+            )
+
+        log.info(f"Exporting inventory to {path} ({format}, chunks of {chunk_size})")
+
+        with InventoryExportWriter(
+            path=path,
+            format=format,
+            chunk_size=chunk_size,
+            row_group_size=row_group_size,
+            include_serialized=include_serialized,
+        ) as writer:
+            writer.write(self.master.as_row(include_serialized=include_serialized))
+
+            for minion in minions:
+                writer.write(minion.as_row(include_serialized=include_serialized))
+
+        return writer.path
+
 
 class SaltInventoryObjectBase(BaseModel):
     name: str | None = Field(default=None)
     host: str | None = Field(default=None)
     os_type: str | None = Field(default=None)
-    distro: str | None = Field(default=None)
+    distro: str | None = Field(
+        default=None, validation_alias=AliasChoices("distro", "linux_distro")
+    )
 
-    def reachable(self) -> bool:
-        """Attempt an ICMP ping request, using the object's 'host' parameter."""
-        with SimpleSpinner(
-            f"Pinging [{self.name}] || If you're seeing this, the host is likely unreachable. A successful ping is close to instant"
-        ):
-            return ping(self.host)
+    ## Memoized encodings (see _Memo), replaced with a new revision whenever a field is
+    #  set. Kept in a slot instead of pydantic private attributes, which cost several
+    #  microseconds per object on every validation & attribute read. Slots are also
+    #  left out of equality checks, copies & pickles.
+    __slots__ = ("_memo",)
 
-    def serialize(self, to_disk: bool = False, overwrite: bool = False) -> bytes:
-        """Serialize inventory objects with msgpack.
+    def model_post_init(self, __context) -> None:
+        object.__setattr__(self, "_memo", _EMPTY_MEMO)
 
-        Returns a bytestring. Optionally, serialize to an output file.
-        """
-        log.info(f"Serializing inventory object {self.name} ({type(self).__name__})")
+    def __setattr__(self, name: str, value) -> None:
+        super().__setattr__(name, value)
+
+        if name in type(self).model_fields:
+            self.invalidate()
+
+    def __copy__(self):
+        ## model_copy(update=...) applies updates after copying, bypassing __setattr__;
+        #  copies start over at revision 0 with nothing memoized
+        copy = super().__copy__()
+        object.__setattr__(copy, "_memo", _EMPTY_MEMO)
+
+        return copy
+
+    def __deepcopy__(self, memo: dict | None = None):
+        copy = super().__deepcopy__(memo)
+        object.__setattr__(copy, "_memo", _EMPTY_MEMO)
+
+        return copy
+
+    def __setstate__(self, state: dict) -> None:
+        super().__setstate__(state)
+        object.__setattr__(self, "_memo", _EMPTY_MEMO)
+
+    @property
+    def revision(self) -> int:
+        """Incremented every time a field is assigned."""
+        return self._memo.revision
+
+    def invalidate(self) -> None:
+        """Drop memoized dump/JSON/msgpack encodings & bump the revision."""
+        object.__setattr__(self, "_memo", _Memo(revision=self._memo.revision + 1))
+
+    def _remember(self, memo: _Memo, **encodings) -> None:
+        ## Skip storing if a field changed while encoding, the result would be stale
+        if self._memo.revision == memo.revision:
+            object.__setattr__(self, "_memo", self._memo._replace(**encodings))
+
+    def cached_dump(self) -> dict:
+        """model_dump(), memoized until a field changes. Don't mutate the result."""
+        memo: _Memo = self._memo
+
+        if memo.dump is not None:
+            return memo.dump
+
+        data: dict = self.model_dump()
+        self._remember(memo, dump=data)
+
+        return data
+
+    def cached_json(self) -> str:
+        """model_dump_json(), memoized until a field changes."""
+        memo: _Memo = self._memo
+
+        if memo.json is not None:
+            return memo.json
 
         try:
             data: str = self.model_dump_json()
@@ -272,6 +783,21 @@ class SaltInventoryObjectBase(BaseModel):
 
             raise msg
 
+        self._remember(memo, json=data)
+
+        return data
+
+    def cached_msgpack(self) -> bytes:
+        """Return the object's JSON as msgpack, memoized until a field changes."""
+        memo: _Memo = self._memo
+
+        if memo.msgpack is not None:
+            return memo.msgpack
+
+        log.debug(f"Serializing inventory object {self.name} ({type(self).__name__})")
+
+        data: str = self.cached_json()
+
         try:
             serial = msgpack_serialize(_json=data)
         except Exception as exc:
@@ -290,8 +816,93 @@ class SaltInventoryObjectBase(BaseModel):
 
             raise msg
 
+        self._remember(memo, msgpack=serial.detail)
+
+        return serial.detail
+
+    def reachable(
+        self,
+        history: ReachabilityHistory | None = None,
+        spinner: bool = True,
+        resolver: HostResolver | None = None,
+        prober: AdaptiveProber | None = None,
+        budget: RetryBudget | None = None,
+    ) -> bool:
+        """Attempt an ICMP ping request, using the object's 'host' parameter.
+
+        Pass a ReachabilityHistory to record the probe result. Pass spinner=False when
+        probing from background threads. Pass a HostResolver to ping the host's cached
+        address; hosts it can't resolve are reported unreachable without pinging. Pass
+        an AdaptiveProber to use RTT-based timeouts & retries instead of a single ping
+        with the system default timeout, and a RetryBudget to take its retries from
+        (default: the prober's current sweep).
+        """
+        address: str | None = self.host
+
+        if resolver is not None:
+            address = resolver.resolve(self.host)
+
+            if address is None:
+                log.warning(f"[{self.name}] host {self.host} could not be resolved")
+
+                if history is not None:
+                    history.record(host=self.host, up=False, name=self.name)
+
+                return False
+
+        def _ping() -> tuple[bool, float | None]:
+            if prober is not None:
+                return prober.probe(self.host, address=address, budget=budget)
+
+            start: float = time.perf_counter()
+            up, rtt_ms = ping_rtt(address)
+
+            if up and rtt_ms is None:
+                rtt_ms = (time.perf_counter() - start) * 1000
+
+            return up, rtt_ms
+
+        if spinner:
+            with SimpleSpinner(
+                f"Pinging [{self.name}] || If you're seeing this, the host is likely unreachable. A successful ping is close to instant"
+            ):
+                up, rtt_ms = _ping()
+        else:
+            up, rtt_ms = _ping()
+
+        if history is not None:
+            history.record(host=self.host, up=up, name=self.name, rtt_ms=rtt_ms)
+
+        return up
+
+    @property
+    def salt_type(self) -> str:
+        if isinstance(self, SaltMaster):
+            return "master"
+        elif isinstance(self, SaltMinion):
+            return "minion"
+        else:
+            return "unknown"
+
+    def as_row(self, include_serialized: bool = True) -> dict:
+        """Dump the object to an inventory DataFrame/export row."""
+        row: dict = {**self.cached_dump(), "salt_type": self.salt_type}
+
+        if include_serialized:
+            row["serialized"] = self.cached_msgpack()
+
+        return row
+
+    def serialize(self, to_disk: bool = False, overwrite: bool = False) -> bytes:
+        """Serialize inventory objects with msgpack.
+
+        Returns a bytestring. Optionally, serialize to an output file. The encoding is
+        memoized (see cached_msgpack()), so repeat calls don't re-encode.
+        """
+        serialized: bytes = self.cached_msgpack()
+
         if not to_disk:
-            return serial.detail
+            return serialized
 
         else:
             filename: str = f"{self.name}.msgpack"
@@ -341,7 +952,7 @@ class SaltInventoryObjectBase(BaseModel):
 
                 try:
                     with open(output_path, "wb+") as f:
-                        f.write(serial.detail)
+                        f.write(serialized)
                 except Exception as exc:
                     msg = Exception(
                         f"Unhandled exception writing serialized object to file {output_path}. Details: {exc}"
@@ -350,7 +961,7 @@ class SaltInventoryObjectBase(BaseModel):
 
                     raise msg
 
-                return serial.detail
+                return serialized
 
             else:
                 log.warning(
@@ -364,7 +975,7 @@ class SaltInventoryObjectBase(BaseModel):
 
                     try:
                         with open(output_path, "wb+") as f:
-                            f.write(serial.detail)
+                            f.write(serialized)
                     except Exception as exc:
                         msg = Exception(
                             f"Unhandled exception writing serialized object to file {output_path}. Details: {exc}"
@@ -373,7 +984,7 @@ class SaltInventoryObjectBase(BaseModel):
 
                         raise msg
 
-                return serial.detail
+                return serialized
 
 
 class SaltMaster(SaltInventoryObjectBase):
@@ -382,3 +993,61 @@ class SaltMaster(SaltInventoryObjectBase):
 
 class SaltMinion(SaltInventoryObjectBase):
     pass
+
+
+def _construct_trusted(
+    model: type[SaltInventoryObjectBase], data: dict
+) -> SaltInventoryObjectBase:
+    """Build a model instance from trusted, canonical data without validation.
+
+    Equivalent to model.model_construct(**data) when data holds every field, but
+    skips model_construct's per-field default handling, which is slower than
+    validation itself for these small models. Falls back to model_construct() if
+    BaseModel's slots ever change.
+    """
+    if _SLOT_SETTERS is None:
+        obj = model.model_construct(**data)
+        ## model_construct() leaves this unset when the model defines model_post_init
+        object.__setattr__(obj, "__pydantic_private__", None)
+
+        return obj
+
+    set_fields_set, set_extra, set_private = _SLOT_SETTERS
+
+    obj = model.__new__(model)
+    object.__setattr__(obj, "__dict__", data)
+    set_fields_set(obj, set(data))
+    set_extra(obj, None)
+    set_private(obj, None)
+
+    ## Initialise private attributes & memo slots, if the model has any
+    if model.__pydantic_post_init__:
+        obj.model_post_init(None)
+
+    return obj
+
+
+def _slot_setters() -> tuple[Callable, Callable, Callable] | None:
+    """Setters for BaseModel's slots, used by _construct_trusted().
+
+    The slots are pydantic internals (stable through pydantic 2.x, see the version
+    bound in pyproject.toml).
+    """
+    try:
+        return tuple(
+            BaseModel.__dict__[slot].__set__
+            for slot in (
+                "__pydantic_fields_set__",
+                "__pydantic_extra__",
+                "__pydantic_private__",
+            )
+        )
+    except (KeyError, AttributeError):
+        log.warning(
+            "pydantic BaseModel slots changed, trusted loads use model_construct()"
+        )
+
+        return None
+
+
+_SLOT_SETTERS: tuple[Callable, Callable, Callable] | None = _slot_setters()
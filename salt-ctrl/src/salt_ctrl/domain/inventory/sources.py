@@ -0,0 +1,508 @@
+from __future__ import annotations
+
+from abc import abstractmethod
+import hashlib
+import io
+import json
+import os
+
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import threading
+from typing import Iterator
+import urllib.error
+import urllib.request
+
+from salt_ctrl.constants import INVENTORY_DIR, PQ_DIR, SNAPSHOT_FILE
+
+from dynaconf import Dynaconf
+from loguru import logger as log
+from pydantic import BaseModel, Field, PrivateAttr
+
+import pandas as pd
+
+
+class InventoryPayload(BaseModel):
+    """Raw (unvalidated) inventory data read from an inventory source.
+
+    The checksum is a sha256 digest of the source's id & the raw bytes the payload was
+    parsed from.
+    Sources build payloads with model_construct(), the master & minion dicts are
+    validated when loaded into a SaltInventory.
+    """
+
+    master: dict | None = Field(default=None)
+    minions: list[dict] = Field(default_factory=list)
+    checksum: str | None = Field(default=None)
+    source_id: str | None = Field(default=None)
+
+
+class InventorySourceBase(BaseModel):
+    """Base class for inventory sources.
+
+    Subclasses implement read(), which unconditionally reads & parses the source,
+    and poll(), which only returns a payload when the source has changed since the
+    last successful poll. Callers refreshing on a timer should use poll() so they
+    only pay parse/validation costs when the underlying data actually changed.
+
+    Callers processing minions one at a time use stream(). Sources that can parse
+    minion records incrementally override it, the default reads the whole payload.
+    """
+
+    @property
+    @abstractmethod
+    def source_id(self) -> str:
+        ...
+
+    @abstractmethod
+    def read(self) -> InventoryPayload:
+        ...
+
+    @abstractmethod
+    def poll(self, force: bool = False) -> InventoryPayload | None:
+        ...
+
+    @abstractmethod
+    def invalidate(self) -> None:
+        """Forget the last seen state, forcing the next poll() to re-read."""
+
+    def stream(self) -> tuple[dict | None, Iterator[dict]]:
+        """Read the raw master & return it with a lazy iterator of raw minion dicts."""
+        payload: InventoryPayload = self.read()
+
+        return payload.master, iter(payload.minions)
+
+
+class FileInventorySourceBase(InventorySourceBase):
+    """Base class for sources backed by one or more files on disk.
+
+    Change detection is done in 2 steps. A cheap os.stat() comparison of
+    (mtime, size) short-circuits unchanged files. If the stat changed, the file
+    contents are hashed; a matching hash (i.e. the file was only touched) is still
+    treated as unchanged, and the contents are not parsed.
+    """
+
+    _stats: dict[str, tuple[int, int]] | None = PrivateAttr(default=None)
+    _checksum: str | None = PrivateAttr(default=None)
+
+    @property
+    @abstractmethod
+    def watched_files(self) -> list[Path]:
+        ...
+
+    @property
+    def source_id(self) -> str:
+        return f"{type(self).__name__}:" + ",".join(str(f) for f in self.watched_files)
+
+    @abstractmethod
+    def parse(self, raw: dict[Path, bytes]) -> InventoryPayload:
+        ...
+
+    def _stat_files(self) -> dict[str, tuple[int, int]]:
+        stats: dict[str, tuple[int, int]] = {}
+
+        for f in self.watched_files:
+            if not f.exists():
+                raise FileNotFoundError(f"Could not find inventory source file: {f}")
+
+            _stat = f.stat()
+            stats[str(f)] = (_stat.st_mtime_ns, _stat.st_size)
+
+        return stats
+
+    def _read_files(self) -> tuple[dict[Path, bytes], str]:
+        raw: dict[Path, bytes] = {}
+        digest = hashlib.sha256()
+
+        ## Sources parsing the same files differently (i.e. Dynaconf environments)
+        #  have different ids, so their payloads don't share a checksum
+        digest.update(self.source_id.encode())
+
+        for f in self.watched_files:
+            with open(f, "rb") as _f:
+                data: bytes = _f.read()
+
+            raw[f] = data
+            digest.update(str(f).encode())
+            digest.update(data)
+
+        return raw, digest.hexdigest()
+
+    def read(self) -> InventoryPayload:
+        raw, checksum = self._read_files()
+
+        payload: InventoryPayload = self.parse(raw)
+        payload.checksum = checksum
+        payload.source_id = self.source_id
+
+        return payload
+
+    def checksum(self) -> str:
+        """Checksum of the watched files' current contents."""
+        return self._read_files()[1]
+
+    def poll(self, force: bool = False) -> InventoryPayload | None:
+        stats: dict[str, tuple[int, int]] = self._stat_files()
+
+        if not force and stats == self._stats:
+            log.debug(f"Inventory source [{self.source_id}] unchanged (stat)")
+            return None
+
+        raw, checksum = self._read_files()
+
+        if not force and checksum == self._checksum:
+            log.debug(f"Inventory source [{self.source_id}] unchanged (checksum)")
+            self._stats = stats
+
+            return None
+
+        payload: InventoryPayload = self.parse(raw)
+        payload.checksum = checksum
+        payload.source_id = self.source_id
+
+        self._stats = stats
+        self._checksum = checksum
+
+        return payload
+
+    def invalidate(self) -> None:
+        self._stats = None
+        self._checksum = None
+
+
+class JSONInventorySource(FileInventorySourceBase):
+    """Read inventory from the master.json & minions.json files in inventory_dir."""
+
+    inventory_dir: Path = Field(default=INVENTORY_DIR)
+
+    @property
+    def master_file(self) -> Path:
+        return Path(f"{self.inventory_dir}/master.json")
+
+    @property
+    def minions_file(self) -> Path:
+        return Path(f"{self.inventory_dir}/minions.json")
+
+    @property
+    def watched_files(self) -> list[Path]:
+        return [self.master_file, self.minions_file]
+
+    def parse(self, raw: dict[Path, bytes]) -> InventoryPayload:
+        master = json.loads(raw[self.master_file])
+        minions: list[dict] = json.loads(raw[self.minions_file])
+
+        ## The example master file wraps the master in a list
+        if isinstance(master, list):
+            master = master[0] if master else None
+
+        return InventoryPayload.model_construct(master=master, minions=minions)
+
+    def stream(self) -> tuple[dict | None, Iterator[dict]]:
+        """Read the master, & parse minions from minions.json as they are iterated."""
+        with open(self.master_file) as f:
+            master = json.load(f)
+
+        if isinstance(master, list):
+            master = master[0] if master else None
+
+        return master, _iter_json_array(self.minions_file)
+
+
+class DynaconfInventorySource(FileInventorySourceBase):
+    """Read inventory from salt_master/salt_minions keys in Dynaconf settings files.
+
+    Pass env to read a specific environment (i.e. [dev], [prod]). When env is None,
+    Dynaconf's default environment selection is used (the ENV_FOR_DYNACONF environment
+    variable, or DEVELOPMENT).
+    """
+
+    root_path: Path = Field(default=Path("config"))
+    settings_files: list[str] = Field(default=["settings.toml", ".secrets.toml"])
+    env: str | None = Field(default=None)
+
+    @property
+    def watched_files(self) -> list[Path]:
+        return [
+            Path(f"{self.root_path}/{f}")
+            for f in self.settings_files
+            if Path(f"{self.root_path}/{f}").exists()
+        ]
+
+    @property
+    def current_env(self) -> str:
+        """The environment parse() reads."""
+        return (
+            self.env or os.environ.get("ENV_FOR_DYNACONF", None) or "DEVELOPMENT"
+        ).upper()
+
+    @property
+    def source_id(self) -> str:
+        return f"{super().source_id}[env:{self.current_env}]"
+
+    def parse(self, raw: dict[Path, bytes]) -> InventoryPayload:
+        settings: Dynaconf = Dynaconf(
+            root_path=str(self.root_path),
+            settings_files=self.settings_files,
+            environments=True,
+            ## Dynaconf doesn't accept env=None, it picks the default env itself
+            **({"env": self.env} if self.env else {}),
+        )
+
+        master = settings.get("salt_master", None)
+        minions = settings.get("salt_minions", [])
+
+        if master is not None:
+            master: dict = master.to_dict()
+
+        minions: list[dict] = [minion.to_dict() for minion in minions]
+
+        return InventoryPayload.model_construct(master=master, minions=minions)
+
+
+class SnapshotInventorySource(FileInventorySourceBase):
+    """Read an inventory snapshot written by SaltInventory.save_snapshot()."""
+
+    path: Path = Field(default=SNAPSHOT_FILE)
+
+    @property
+    def watched_files(self) -> list[Path]:
+        return [self.path]
+
+    def parse(self, raw: dict[Path, bytes]) -> InventoryPayload:
+        data: dict = json.loads(raw[self.path])
+
+        return InventoryPayload.model_construct(
+            master=data.get("master", None), minions=data.get("minions", [])
+        )
+
+
+class ParquetInventorySource(FileInventorySourceBase):
+    """Read inventory from a Parquet snapshot written by SaltInventory.df()."""
+
+    path: Path = Field(default=Path(f"{PQ_DIR}/inventory.parquet"))
+
+    @property
+    def watched_files(self) -> list[Path]:
+        return [self.path]
+
+    def parse(self, raw: dict[Path, bytes]) -> InventoryPayload:
+        df: pd.DataFrame = pd.read_parquet(io.BytesIO(raw[self.path]))
+        df = df.drop(columns=["serialized"], errors="ignore")
+        df = df.astype(object).where(df.notna(), None)
+
+        records: list[dict] = df.to_dict(orient="records")
+
+        master: dict | None = None
+        minions: list[dict] = []
+
+        for record in records:
+            salt_type = record.pop("salt_type", None)
+
+            if salt_type == "master":
+                master = record
+            else:
+                minions.append(record)
+
+        return InventoryPayload.model_construct(master=master, minions=minions)
+
+
+class HTTPInventorySource(InventorySourceBase):
+    """Read inventory from an HTTP endpoint returning {"master": {}, "minions": []}.
+
+    Polling sends If-None-Match/If-Modified-Since headers from the previous response,
+    and a 304 Not Modified response is treated as unchanged. Servers that don't
+    support conditional requests fall back to a checksum comparison of the body.
+    """
+
+    url: str = Field(default=None)
+    timeout: float = Field(default=10.0)
+
+    _etag: str | None = PrivateAttr(default=None)
+    _last_modified: str | None = PrivateAttr(default=None)
+    _checksum: str | None = PrivateAttr(default=None)
+
+    @property
+    def source_id(self) -> str:
+        return f"{type(self).__name__}:{self.url}"
+
+    def _request(self, conditional: bool = True) -> tuple[bytes | None, dict]:
+        if not self.url:
+            raise ValueError("Missing inventory source URL")
+
+        headers: dict[str, str] = {"Accept": "application/json"}
+
+        if conditional:
+            if self._etag:
+                headers["If-None-Match"] = self._etag
+            if self._last_modified:
+                headers["If-Modified-Since"] = self._last_modified
+
+        req = urllib.request.Request(self.url, headers=headers)
+
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as res:
+                return res.read(), dict(res.headers)
+        except urllib.error.HTTPError as http_err:
+            if http_err.code == 304:
+                return None, dict(http_err.headers)
+
+            raise
+
+    def _parse(self, body: bytes) -> InventoryPayload:
+        data: dict = json.loads(body)
+
+        return InventoryPayload.model_construct(
+            master=data.get("master", None),
+            minions=data.get("minions", []),
+            checksum=hashlib.sha256(body).hexdigest(),
+            source_id=self.source_id,
+        )
+
+    def read(self) -> InventoryPayload:
+        body, _ = self._request(conditional=False)
+
+        return self._parse(body)
+
+    def poll(self, force: bool = False) -> InventoryPayload | None:
+        body, headers = self._request(conditional=not force)
+
+        if body is None:
+            log.debug(f"Inventory source [{self.source_id}] unchanged (304)")
+            return None
+
+        checksum: str = hashlib.sha256(body).hexdigest()
+
+        self._etag = headers.get("ETag", None)
+        self._last_modified = headers.get("Last-Modified", None)
+
+        if not force and checksum == self._checksum:
+            log.debug(f"Inventory source [{self.source_id}] unchanged (checksum)")
+            return None
+
+        payload: InventoryPayload = self._parse(body)
+        self._checksum = checksum
+
+        return payload
+
+    def invalidate(self) -> None:
+        self._etag = None
+        self._last_modified = None
+        self._checksum = None
+
+
+def _iter_json_array(path: Path = None, chunk_size: int = 64 * 1024) -> Iterator:
+    """Yield the items of a JSON array file one at a time.
+
+    The file is read in chunk_size pieces, so memory use is bounded by the largest
+    item rather than the whole file.
+    """
+    if path is None:
+        raise ValueError("Missing JSON file path")
+
+    decoder: json.JSONDecoder = json.JSONDecoder()
+
+    with open(path, encoding="utf-8") as f:
+        buffer: str = f.read(chunk_size).lstrip()
+        eof: bool = False
+
+        if not buffer.startswith("["):
+            raise ValueError(f"Expected a JSON array in {path}")
+
+        buffer = buffer[1:]
+
+        while True:
+            buffer = buffer.lstrip().removeprefix(",").lstrip()
+
+            if buffer.startswith("]"):
+                return
+
+            try:
+                item, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                item, end = None, len(buffer)
+
+            ## An item is only complete once the next delimiter was read, otherwise
+            #  it (i.e. a number) may be cut off by the chunk boundary
+            if end >= len(buffer) or buffer[end] not in ",] \t\r\n":
+                if eof:
+                    raise ValueError(f"Truncated or invalid JSON array in {path}")
+
+                chunk: str = f.read(chunk_size)
+                eof = not chunk
+                buffer += chunk
+
+                continue
+
+            yield item
+
+            buffer = buffer[end:]
+
+
+def serve_inventory(
+    source: InventorySourceBase = None,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+) -> ThreadingHTTPServer:
+    """Create a local HTTP server exposing an inventory source as JSON.
+
+    Stand-in for a remote inventory/CMDB endpoint, to be read by HTTPInventorySource.
+    Responses carry ETag & Last-Modified headers and honor conditional requests. The
+    server is returned unstarted; call serve_forever() (i.e. in a thread) to start it.
+    """
+    if source is None:
+        raise ValueError("Missing inventory source to serve")
+
+    state: dict = {"body": b"", "etag": None, "last_modified": None}
+    lock: threading.Lock = threading.Lock()
+
+    def _refresh() -> None:
+        with lock:
+            payload: InventoryPayload | None = source.poll()
+
+            if payload is None:
+                return
+
+            state["body"] = json.dumps(
+                {"master": payload.master, "minions": payload.minions}
+            ).encode()
+            state["etag"] = f'"{payload.checksum}"'
+            state["last_modified"] = formatdate(usegmt=True)
+
+    class InventoryRequestHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            _refresh()
+
+            ## RFC 7232 3.3: If-Modified-Since is ignored when If-None-Match is sent,
+            #  Last-Modified only has 1s resolution
+            if_none_match: str | None = self.headers.get("If-None-Match", None)
+            if if_none_match is not None:
+                not_modified: bool = (
+                    state["etag"] in (tag.strip() for tag in if_none_match.split(","))
+                    or if_none_match.strip() == "*"
+                )
+            else:
+                not_modified = (
+                    self.headers.get("If-Modified-Since", None)
+                    == state["last_modified"]
+                )
+
+            if not_modified:
+                self.send_response(304)
+                self.send_header("ETag", state["etag"])
+                self.end_headers()
+
+                return
+
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(state["body"])))
+            self.send_header("ETag", state["etag"])
+            self.send_header("Last-Modified", state["last_modified"])
+            self.end_headers()
+            self.wfile.write(state["body"])
+
+        def log_message(self, format, *args):
+            log.debug(f"Inventory HTTP server: {format % args}")
+
+    return ThreadingHTTPServer((host, port), InventoryRequestHandler)
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from functools import cache
+import hashlib
+import json
+import os
+
+from pathlib import Path
+import threading
+
+from salt_ctrl.constants import TRUSTED_CHECKSUMS_FILE
+
+from loguru import logger as log
+from pydantic import BaseModel, Field, PrivateAttr
+
+
+class TrustedChecksums(BaseModel):
+    """Checksums of inventory data that already passed full validation.
+
+    Checksums are trusted per inventory source (by source id), so data is only
+    constructed without validation when re-read from the source that validated it.
+    Entries are tied to a fingerprint of the inventory schemas; if SaltMaster or
+    SaltMinion change, every previously trusted checksum is discarded. Only the
+    newest max_entries checksums are kept.
+    """
+
+    path: Path = Field(default=TRUSTED_CHECKSUMS_FILE)
+    max_entries: int = Field(default=32)
+
+    _checksums: dict[str, str] | None = PrivateAttr(default=None)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    def _load(self) -> dict[str, str]:
+        if self._checksums is not None:
+            return self._checksums
+
+        self._checksums = {}
+
+        if not self.path.exists():
+            return self._checksums
+
+        try:
+            with open(self.path) as f:
+                data: dict = json.load(f)
+        except Exception as exc:
+            log.warning(
+                f"Could not read trusted checksums file {self.path}, ignoring it. Details: {exc}"
+            )
+
+            return self._checksums
+
+        if data.get("schema", None) != schema_fingerprint():
+            log.info("Inventory schema changed, discarding trusted checksums")
+
+            return self._checksums
+
+        self._checksums = data.get("checksums", {})
+
+        return self._checksums
+
+    def is_trusted(
+        self, checksum: str | None = None, source_id: str | None = None
+    ) -> bool:
+        if not checksum or not source_id:
+            return False
+
+        with self._lock:
+            return _trust_key(checksum, source_id) in self._load()
+
+    def trust(self, checksum: str = None, source_id: str = None) -> None:
+        """Record a source's checksum as validated & persist the trusted checksums file."""
+        if not checksum:
+            raise ValueError("Missing checksum to trust")
+        if not source_id:
+            raise ValueError("Missing source id to trust checksum for")
+
+        with self._lock:
+            checksums: dict[str, str] = self._load()
+            checksums[_trust_key(checksum, source_id)] = datetime.now(
+                timezone.utc
+            ).isoformat()
+
+            ## Keep the newest entries (ISO timestamps sort chronologically)
+            newest: list[str] = sorted(checksums, key=checksums.get, reverse=True)
+            for stale in newest[self.max_entries :]:
+                checksums.pop(stale)
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file: Path = self.path.with_suffix(".tmp")
+
+            with open(tmp_file, "w") as f:
+                json.dump({"schema": schema_fingerprint(), "checksums": checksums}, f)
+
+            os.replace(tmp_file, self.path)
+
+
+def _trust_key(checksum: str, source_id: str) -> str:
+    return f"{source_id}@{checksum}"
+
+
+@cache
+def schema_fingerprint() -> str:
+    """Hash of the SaltMaster & SaltMinion JSON schemas."""
+    from .schemas import SaltMaster, SaltMinion
+
+    schemas: str = json.dumps(
+        [SaltMaster.model_json_schema(), SaltMinion.model_json_schema()],
+        sort_keys=True,
+    )
+
+    return hashlib.sha256(schemas.encode()).hexdigest()
@@ -0,0 +1,565 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+import json
+import os
+
+from pathlib import Path
+import threading
+from typing import IO, Iterator
+
+from salt_ctrl.constants import REACHABILITY_DIR
+from salt_ctrl.utils.net_utils import RttEstimator
+
+from loguru import logger as log
+from pydantic import BaseModel, Field, PrivateAttr
+
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:
+    ## Not available on Windows, the history is then only safe within one process
+    fcntl = None
+
+## Column dtypes for history DataFrames
+HISTORY_DTYPES: dict[str, str] = {
+    "name": "category",
+    "host": "category",
+    "up": "bool",
+    "rtt_ms": "float32",
+}
+
+
+class ProbeResult(BaseModel):
+    timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    name: str | None = Field(default=None)
+    host: str | None = Field(default=None)
+    up: bool = Field(default=False)
+    rtt_ms: float | None = Field(default=None)
+
+    def as_log_line(self) -> str:
+        return (
+            json.dumps(
+                {
+                    "ts": self.timestamp.timestamp(),
+                    "name": self.name,
+                    "host": self.host,
+                    "up": self.up,
+                    "rtt_ms": self.rtt_ms,
+                }
+            )
+            + "\n"
+        )
+
+
+class ReachabilityHistory(BaseModel):
+    """Time-series store of reachability probe results.
+
+    Probes are appended to a line-delimited JSON log (O(1) per probe). The log is
+    periodically compacted into Parquet files partitioned by day
+    (history_dir/parquet/day=YYYY-MM-DD/probes.parquet), either by calling compact()
+    or in a background thread once the log grows past compact_bytes. Queries read only
+    the day partitions overlapping the requested window, plus the uncompacted log.
+
+    Log lines that can't be parsed (i.e. truncated by a crash mid-write) are skipped,
+    and moved to rejected_file on the next compaction.
+
+    Several processes (i.e. the daemon & local CLI commands) can share a history_dir.
+    Appends hold a shared flock on log_lock_file & rotating the log holds an exclusive
+    one, so no probe is written to a log while it is moved aside. Compactions & loads
+    are serialized across processes with a flock on compact_lock_file.
+    """
+
+    history_dir: Path = Field(default=REACHABILITY_DIR)
+    compact_bytes: int = Field(default=8 * 1024 * 1024)
+
+    _log: IO | None = PrivateAttr(default=None)
+    _log_lock: IO | None = PrivateAttr(default=None)
+    _compact_file_lock: IO | None = PrivateAttr(default=None)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _compact_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _compactor: threading.Thread | None = PrivateAttr(default=None)
+
+    @property
+    def log_file(self) -> Path:
+        return Path(f"{self.history_dir}/probes.log")
+
+    @property
+    def pending_file(self) -> Path:
+        """Log being compacted, moved aside so probes can keep appending."""
+        return Path(f"{self.history_dir}/probes.log.compacting")
+
+    @property
+    def rejected_file(self) -> Path:
+        return Path(f"{self.history_dir}/probes.log.rejected")
+
+    @property
+    def log_lock_file(self) -> Path:
+        return Path(f"{self.history_dir}/probes.log.lock")
+
+    @property
+    def compact_lock_file(self) -> Path:
+        return Path(f"{self.history_dir}/compact.lock")
+
+    @property
+    def parquet_dir(self) -> Path:
+        return Path(f"{self.history_dir}/parquet")
+
+    def day_partition(self, day: str) -> Path:
+        return Path(f"{self.parquet_dir}/day={day}/probes.parquet")
+
+    def _open_log(self) -> IO:
+        self.log_file.parent.mkdir(parents=True, exist_ok=True)
+        _log: IO = open(self.log_file, "a+b")
+
+        ## Don't append to a line left truncated by a crash
+        if _log.tell() > 0:
+            _log.seek(-1, os.SEEK_END)
+            if _log.read(1) != b"\n":
+                _log.write(b"\n")
+
+        return _log
+
+    def _log_is_current(self) -> bool:
+        """Check the open log is still log_file, not moved aside by another process."""
+        try:
+            return os.fstat(self._log.fileno()).st_ino == self.log_file.stat().st_ino
+        except FileNotFoundError:
+            return False
+
+    def _open_lock_file(self, path: Path) -> IO:
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        return open(path, "a+b")
+
+    def append(self, result: ProbeResult = None) -> None:
+        """Append a probe result to the history log."""
+        if result is None:
+            raise ValueError("Missing ProbeResult to append")
+
+        with self._lock:
+            if self._log_lock is None:
+                self._log_lock = self._open_lock_file(self.log_lock_file)
+
+            with _flock(self._log_lock, shared=True):
+                if self._log is not None and not self._log_is_current():
+                    self._log.close()
+                    self._log = None
+
+                if self._log is None:
+                    self._log = self._open_log()
+
+                self._log.write(result.as_log_line().encode())
+                self._log.flush()
+
+            should_compact: bool = self._log.tell() >= self.compact_bytes
+
+            if should_compact and (
+                self._compactor is None or not self._compactor.is_alive()
+            ):
+                self._compactor = threading.Thread(
+                    target=self._compact_in_background,
+                    name="reachability-compact",
+                    daemon=True,
+                )
+                self._compactor.start()
+
+    def _compact_in_background(self) -> None:
+        try:
+            self.compact()
+        except Exception as exc:
+            log.error(
+                Exception(
+                    f"Unhandled exception compacting reachability log in the background. Details: {exc}"
+                )
+            )
+
+    def record(
+        self,
+        host: str = None,
+        up: bool = False,
+        name: str | None = None,
+        rtt_ms: float | None = None,
+    ) -> ProbeResult:
+        result: ProbeResult = ProbeResult(name=name, host=host, up=up, rtt_ms=rtt_ms)
+        self.append(result)
+
+        return result
+
+    def close(self) -> None:
+        """Close the log, waiting for a running background compaction to finish."""
+        compactor: threading.Thread | None = self._compactor
+        if compactor is not None and compactor is not threading.current_thread():
+            compactor.join()
+
+        with self._lock:
+            for _file in (self._log, self._log_lock):
+                if _file is not None:
+                    _file.close()
+
+            self._log = None
+            self._log_lock = None
+
+        with self._compact_lock:
+            if self._compact_file_lock is not None:
+                self._compact_file_lock.close()
+                self._compact_file_lock = None
+
+    def _parse_log(self, path: Path) -> tuple[pd.DataFrame, list[bytes]]:
+        """Parse a probe log line by line, returning (history, unparseable lines)."""
+        if not path.exists() or path.stat().st_size == 0:
+            return _empty_history(), []
+
+        records: list[dict] = []
+        rejected: list[bytes] = []
+
+        with open(path, "rb") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+
+                try:
+                    record: dict = json.loads(line)
+                    records.append(
+                        {
+                            "ts": float(record["ts"]),
+                            "name": record.get("name", None),
+                            "host": record["host"],
+                            "up": bool(record["up"]),
+                            "rtt_ms": record.get("rtt_ms", None),
+                        }
+                    )
+                except (ValueError, TypeError, KeyError):
+                    rejected.append(line.rstrip(b"\n"))
+
+        if rejected:
+            log.warning(f"Skipped [{len(rejected)}] unparseable line(s) in {path}")
+
+        if not records:
+            return _empty_history(), rejected
+
+        df: pd.DataFrame = pd.DataFrame.from_records(records)
+        df["timestamp"] = pd.to_datetime(df.pop("ts"), unit="s", utc=True)
+
+        return _normalize_history(df), rejected
+
+    def _read_log(self) -> pd.DataFrame:
+        """Uncompacted history: the log, plus the log being compacted (if any)."""
+        dfs: list[pd.DataFrame] = [
+            df
+            for df in (
+                self._parse_log(self.pending_file)[0],
+                self._parse_log(self.log_file)[0],
+            )
+            if not df.empty
+        ]
+
+        if not dfs:
+            return _empty_history()
+
+        return _normalize_history(pd.concat(dfs, ignore_index=True))
+
+    def _rotate_log(self) -> None:
+        """Move the log aside to pending_file, so appends continue on a new log.
+
+        Other processes notice the log was moved on their next append & reopen it.
+        """
+        with self._lock:
+            if self._log_lock is None:
+                self._log_lock = self._open_lock_file(self.log_lock_file)
+
+            with _flock(self._log_lock):
+                if self._log is not None:
+                    self._log.close()
+                    self._log = None
+
+                if not self.log_file.exists() or self.log_file.stat().st_size == 0:
+                    return
+
+                if not self.pending_file.exists():
+                    os.replace(self.log_file, self.pending_file)
+
+                    return
+
+                ## Left over from an interrupted compaction, compact both
+                leftover: bytes = self.log_file.read_bytes()
+                with open(self.pending_file, "ab") as pending:
+                    pending.write(b"\n" + leftover)
+                open(self.log_file, "w").close()
+
+    @contextmanager
+    def _compacting(self, shared: bool = False) -> Iterator[None]:
+        """Serialize compactions (& loads, with shared=True) across threads & processes."""
+        with self._compact_lock:
+            if self._compact_file_lock is None:
+                self._compact_file_lock = self._open_lock_file(self.compact_lock_file)
+
+            with _flock(self._compact_file_lock, shared=shared):
+                yield
+
+    def compact(self) -> int:
+        """Merge the probe log into the day-partitioned Parquet store.
+
+        Probes recorded while compacting go to a new log, so callers are never blocked
+        for longer than it takes to rename the log. Returns the number of probe
+        results compacted.
+        """
+        with self._compacting():
+            self._rotate_log()
+
+            try:
+                df, rejected = self._parse_log(self.pending_file)
+            except Exception as exc:
+                msg = Exception(
+                    f"Unhandled exception reading reachability log {self.pending_file}. Details: {exc}"
+                )
+                log.error(msg)
+
+                raise msg
+
+            if rejected:
+                with open(self.rejected_file, "ab") as f:
+                    f.write(b"\n".join(rejected) + b"\n")
+
+                log.warning(
+                    f"Moved [{len(rejected)}] unparseable probe log line(s) to {self.rejected_file}"
+                )
+
+            if not df.empty:
+                log.info(
+                    f"Compacting [{df.shape[0]}] probe result(s) to {self.parquet_dir}"
+                )
+
+            for day, day_df in df.groupby(df["timestamp"].dt.strftime("%Y-%m-%d")):
+                output_file: Path = self.day_partition(day)
+                output_file.parent.mkdir(parents=True, exist_ok=True)
+
+                if output_file.exists():
+                    day_df = pd.concat(
+                        [pd.read_parquet(output_file, engine="fastparquet"), day_df],
+                        ignore_index=True,
+                    )
+
+                day_df = _normalize_history(day_df).sort_values(
+                    "timestamp", kind="stable"
+                )
+
+                tmp_file: Path = output_file.with_suffix(".parquet.tmp")
+                day_df.to_parquet(path=tmp_file, engine="fastparquet", index=False)
+                os.replace(tmp_file, output_file)
+
+            ## Remove the compacted log only after every partition was written
+            self.pending_file.unlink(missing_ok=True)
+
+            return df.shape[0]
+
+    def load(
+        self,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        hosts: list[str] | None = None,
+    ) -> pd.DataFrame:
+        """Load probe history between since & until (default: everything)."""
+        since = _as_utc(since) if since else None
+        until = _as_utc(until) if until else None
+
+        first_day: str | None = since.strftime("%Y-%m-%d") if since else None
+        last_day: str | None = until.strftime("%Y-%m-%d") if until else None
+
+        dfs: list[pd.DataFrame] = []
+
+        ## Don't read partitions & the pending log mid-compaction
+        with self._compacting(shared=True):
+            if self.parquet_dir.exists():
+                for partition in sorted(self.parquet_dir.glob("day=*/probes.parquet")):
+                    day: str = partition.parent.name.removeprefix("day=")
+
+                    if first_day and day < first_day:
+                        continue
+                    if last_day and day > last_day:
+                        continue
+
+                    dfs.append(pd.read_parquet(partition, engine="fastparquet"))
+
+            with self._lock:
+                if self._log_lock is None:
+                    self._log_lock = self._open_lock_file(self.log_lock_file)
+
+                ## Exclusive, so no process is mid-way through appending a line
+                with _flock(self._log_lock):
+                    dfs.append(self._read_log())
+
+        dfs = [df for df in dfs if not df.empty]
+
+        if not dfs:
+            return _empty_history()
+
+        df: pd.DataFrame = _normalize_history(pd.concat(dfs, ignore_index=True))
+
+        if since:
+            df = df[df["timestamp"] >= pd.Timestamp(since)]
+        if until:
+            df = df[df["timestamp"] <= pd.Timestamp(until)]
+        if hosts is not None:
+            df = df[df["host"].isin(hosts)]
+
+        return df.sort_values(["host", "timestamp"], kind="stable").reset_index(
+            drop=True
+        )
+
+    def uptime(
+        self, since: datetime | None = None, history: pd.DataFrame | None = None
+    ) -> pd.DataFrame:
+        """Per-host uptime rollup.
+
+        Columns: probes, up, uptime (ratio of successful probes), mean_rtt_ms,
+        last_seen (last probe) & last_up (last successful probe).
+        """
+        df: pd.DataFrame = self.load(since=since) if history is None else history
+
+        grouped = df.groupby("host", observed=True)
+        rollup: pd.DataFrame = grouped.agg(
+            probes=("up", "size"),
+            up=("up", "sum"),
+            mean_rtt_ms=("rtt_ms", "mean"),
+            last_seen=("timestamp", "max"),
+        )
+        rollup["uptime"] = rollup["up"] / rollup["probes"]
+        rollup["last_up"] = (
+            df[df["up"]].groupby("host", observed=True)["timestamp"].max()
+        )
+
+        return rollup
+
+    def flapping(
+        self,
+        since: datetime | None = None,
+        min_transitions: int = 4,
+        history: pd.DataFrame | None = None,
+    ) -> pd.DataFrame:
+        """Return hosts that changed between up & down at least min_transitions times."""
+        df: pd.DataFrame = self.load(since=since) if history is None else history
+
+        if df.empty:
+            return pd.DataFrame(columns=["transitions"])
+
+        previous: pd.Series = df.groupby("host", observed=True)["up"].shift()
+        changed: pd.Series = previous.notna() & (df["up"] != previous)
+
+        transitions: pd.Series = changed.groupby(df["host"], observed=True).sum()
+        flapping: pd.DataFrame = transitions[transitions >= min_transitions].to_frame(
+            "transitions"
+        )
+
+        return flapping.sort_values("transitions", ascending=False)
+
+    def sweep_order(
+        self,
+        hosts: list[str] = None,
+        since: datetime | None = None,
+        dead_after: timedelta = timedelta(days=3),
+    ) -> list[str]:
+        """Order hosts for a reachability sweep, deprioritising chronically dead hosts.
+
+        Hosts with no successful probe within dead_after (but with probes in that
+        window) are moved to the end of the sweep. Otherwise, input order is kept.
+        """
+        if hosts is None:
+            raise ValueError("Missing list of hosts to order")
+
+        now: datetime = datetime.now(timezone.utc)
+        rollup: pd.DataFrame = self.uptime(since=since or now - dead_after)
+
+        if rollup.empty:
+            return list(hosts)
+
+        last_up: pd.Series = rollup["last_up"].reindex(list(hosts))
+        probed: pd.Series = rollup["probes"].reindex(list(hosts)).fillna(0) > 0
+        dead: pd.Series = probed & last_up.isna()
+
+        alive_hosts: list[str] = [h for h in hosts if not dead.get(h, False)]
+        dead_hosts: list[str] = [h for h in hosts if dead.get(h, False)]
+
+        if dead_hosts:
+            log.debug(f"Deprioritising [{len(dead_hosts)}] dead host(s) in sweep")
+
+        return alive_hosts + dead_hosts
+
+    def rtt_estimator(
+        self,
+        since: datetime | None = None,
+        samples: int = 16,
+        estimator: RttEstimator | None = None,
+    ) -> RttEstimator:
+        """Seed an RttEstimator with each host's last `samples` successful probe RTTs.
+
+        Defaults to the last day of history. Pass an estimator to seed it in place.
+        """
+        estimator = estimator or RttEstimator()
+        df: pd.DataFrame = self.load(
+            since=since or datetime.now(timezone.utc) - timedelta(days=1)
+        )
+        df = df[df["up"] & df["rtt_ms"].notna()]
+
+        if df.empty:
+            return estimator
+
+        recent: pd.DataFrame = df.groupby("host", observed=True).tail(samples)
+
+        for host, rtt_ms in zip(recent["host"], recent["rtt_ms"]):
+            estimator.observe(host, float(rtt_ms) / 1000)
+
+        log.debug(
+            f"Seeded RTT estimates for [{recent['host'].nunique()}] host(s) from history"
+        )
+
+        return estimator
+
+
+@contextmanager
+def _flock(lock_file: IO, shared: bool = False) -> Iterator[None]:
+    """Hold an flock on an open lock file, for exclusion across processes.
+
+    Threads sharing lock_file must already be serialized by a threading lock, since
+    flocks on one open file are shared by every thread of the process.
+    """
+    if fcntl is None:
+        yield
+
+        return
+
+    fcntl.flock(lock_file.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+    try:
+        yield
+    finally:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def _as_utc(dt: datetime) -> datetime:
+    ## Day partitions are in UTC, treat naive datetimes as UTC
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+
+    return dt.astimezone(timezone.utc)
+
+
+def _empty_history() -> pd.DataFrame:
+    return _normalize_history(
+        pd.DataFrame(
+            {
+                "timestamp": pd.Series([], dtype="datetime64[ns, UTC]"),
+                "name": [],
+                "host": [],
+                "up": [],
+                "rtt_ms": [],
+            }
+        )
+    )
+
+
+def _normalize_history(df: pd.DataFrame) -> pd.DataFrame:
+    df = df[["timestamp", "name", "host", "up", "rtt_ms"]]
+
+    return df.astype(HISTORY_DTYPES)
@@ -0,0 +1,338 @@
+from __future__ import annotations
+
+import argparse
+import json
+
+from pathlib import Path
+import sys
+
+from salt_ctrl.constants import DAEMON_SOCKET
+from salt_ctrl.daemon import daemon_running, send_request
+
+## Heavy modules (inventory, pandas, Jinja) are only imported when a command runs
+#  locally or starts the daemon. With a daemon running, commands are forwarded over
+#  the Unix socket and answer without loading the inventory.
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="salt_ctrl", description="Manage a Salt stack."
+    )
+    parser.add_argument(
+        "--socket", default=str(DAEMON_SOCKET), help="Path to the daemon Unix socket"
+    )
+    parser.add_argument(
+        "--local",
+        action="store_true",
+        help="Run the command in this process, even if a daemon is running",
+    )
+    parser.add_argument(
+        "--no-history",
+        action="store_true",
+        help="Don't record probe results to the reachability history",
+    )
+
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    daemon_parser = subparsers.add_parser("daemon", help="Manage the resident daemon")
+    daemon_parser.add_argument("action", choices=["start", "stop", "status"])
+
+    query_parser = subparsers.add_parser("query", help="Query inventory nodes")
+    query_parser.add_argument("--name", default=None)
+    query_parser.add_argument("--os-type", default=None)
+    query_parser.add_argument("--distro", default=None)
+    query_parser.add_argument("--salt-type", choices=["master", "minion"], default=None)
+
+    probe_parser = subparsers.add_parser("probe", help="Check node reachability")
+    probe_parser.add_argument("names", nargs="*", help="Node names (default: all)")
+
+    resolve_parser = subparsers.add_parser(
+        "resolve", help="Resolve node hostnames to IP addresses"
+    )
+    resolve_parser.add_argument("names", nargs="*", help="Node names (default: all)")
+
+    render_parser = subparsers.add_parser(
+        "render", help="Render master & minion scripts"
+    )
+    render_parser.add_argument(
+        "--env",
+        dest="envs",
+        action="append",
+        default=[],
+        help="Dynaconf environment to render (repeatable, batch mode, always local)",
+    )
+    render_parser.add_argument(
+        "--inventory",
+        dest="inventories",
+        action="append",
+        default=[],
+        metavar="NAME=DIR",
+        help="JSON inventory directory to render as NAME (repeatable, batch mode)",
+    )
+    render_parser.add_argument("--settings-root", default="config")
+    render_parser.add_argument(
+        "--output-root",
+        default=None,
+        help="Batch output root, scripts go to <output-root>/<name>",
+    )
+    render_parser.add_argument("--workers", type=int, default=None)
+
+    export_parser = subparsers.add_parser(
+        "export", help="Stream the inventory to a Parquet/Arrow IPC file"
+    )
+    export_parser.add_argument("--output", default=None, help="Output file path")
+    export_parser.add_argument(
+        "--format", choices=["parquet", "ipc"], default="parquet"
+    )
+    export_parser.add_argument("--chunk-size", type=int, default=10_000)
+    export_parser.add_argument("--row-group-size", type=int, default=None)
+    export_parser.add_argument("--no-serialized", action="store_true")
+
+    pipeline_parser = subparsers.add_parser(
+        "pipeline",
+        help="Stream minions through validate/probe/render/persist (always local)",
+    )
+    pipeline_parser.add_argument("--no-probe", action="store_true")
+    pipeline_parser.add_argument("--chunk-size", type=int, default=500)
+    pipeline_parser.add_argument("--queue-size", type=int, default=64)
+    pipeline_parser.add_argument("--probe-workers", type=int, default=32)
+    pipeline_parser.add_argument("--render-workers", type=int, default=4)
+
+    discover_parser = subparsers.add_parser(
+        "discover",
+        help="Sweep CIDR ranges for SSH/Salt hosts & add them as minions (always local)",
+    )
+    discover_parser.add_argument("cidrs", nargs="+", help="i.e. 10.0.0.0/16")
+    discover_parser.add_argument(
+        "--ports",
+        type=lambda value: [int(port) for port in value.split(",")],
+        default=None,
+        help="Comma-separated ports to probe (default: 22,4505,4506)",
+    )
+    discover_parser.add_argument("--rate", type=float, default=5000.0)
+    discover_parser.add_argument("--concurrency", type=int, default=4096)
+    discover_parser.add_argument("--timeout", type=float, default=1.0)
+    discover_parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help="Shorten timeouts per subnet from observed connect times",
+    )
+    discover_parser.add_argument("--name-prefix", default="minion")
+    discover_parser.add_argument(
+        "--include-closed",
+        action="store_true",
+        help="Also add hosts that are alive but have no open port",
+    )
+    discover_parser.add_argument(
+        "--save", action="store_true", help="Write merged minions to minions.json"
+    )
+
+    subparsers.add_parser("reload", help="Force an inventory reload")
+
+    return parser.parse_args(argv)
+
+
+def build_request(args: argparse.Namespace) -> dict:
+    match args.command:
+        case "query":
+            return {
+                "cmd": "query",
+                "args": {
+                    "name": args.name,
+                    "os_type": args.os_type,
+                    "distro": args.distro,
+                    "salt_type": args.salt_type,
+                },
+            }
+        case "probe":
+            return {
+                "cmd": "probe",
+                "args": {
+                    "names": args.names or None,
+                    "record_history": not args.no_history,
+                },
+            }
+        case "resolve":
+            return {"cmd": "resolve", "args": {"names": args.names or None}}
+        case "export":
+            return {
+                "cmd": "export",
+                "args": {
+                    ## The daemon runs in its own working directory
+                    "path": str(Path(args.output).resolve()) if args.output else None,
+                    "format": args.format,
+                    "chunk_size": args.chunk_size,
+                    "row_group_size": args.row_group_size,
+                    "include_serialized": not args.no_serialized,
+                },
+            }
+        case _:
+            return {"cmd": args.command}
+
+
+def run_daemon_command(args: argparse.Namespace) -> int:
+    running: bool = daemon_running(args.socket)
+
+    match args.action:
+        case "status":
+            print(f"daemon {'running' if running else 'stopped'} ({args.socket})")
+
+            return 0 if running else 1
+        case "stop":
+            if not running:
+                print(f"No daemon running on {args.socket}")
+
+                return 1
+
+            send_request({"cmd": "shutdown"}, socket_path=args.socket)
+
+            return 0
+        case "start":
+            from salt_ctrl.daemon.server import InventoryState, serve
+
+            serve(
+                state=InventoryState(record_history=not args.no_history),
+                socket_path=args.socket,
+            )
+
+            return 0
+
+
+def run_pipeline_command(args: argparse.Namespace) -> int:
+    from salt_ctrl.daemon.server import InventoryState
+    from salt_ctrl.utils.salt_inventory_utils import run_inventory_pipeline
+
+    state: InventoryState = InventoryState(record_history=not args.no_history)
+
+    pipeline, _ = run_inventory_pipeline(
+        inventory=state.inventory,
+        template_env=state.template_env,
+        probe=not args.no_probe,
+        history=state.history,
+        resolver=state.resolver,
+        prober=state.prober,
+        chunk_size=args.chunk_size,
+        queue_size=args.queue_size,
+        concurrency={"probe": args.probe_workers, "render": args.render_workers},
+    )
+    print(pipeline.summary())
+
+    unreachable = pipeline.dropped.get("probe", [])
+    if unreachable:
+        print(
+            f"\n[{len(unreachable)}] unreachable minion(s) skipped: "
+            + ", ".join(sorted(minion.name for minion in unreachable))
+        )
+
+    return 0 if not any(stats.errors for stats in pipeline.stats) else 1
+
+
+def run_render_batch_command(args: argparse.Namespace) -> int:
+    from salt_ctrl.constants import SCRIPT_OUTPUT_DIR, TEMPLATES_DIR
+    from salt_ctrl.domain.inventory import SaltInventory
+    from salt_ctrl.utils.jinja_utils import get_loader_env, load_template_dir
+    from salt_ctrl.utils.net_utils import HostResolver
+    from salt_ctrl.utils.salt_inventory_utils import render_environments
+
+    inventories: dict[str, SaltInventory] = {}
+    for spec in args.inventories:
+        name, sep, inventory_dir = spec.partition("=")
+        if not sep or not name or not inventory_dir:
+            raise ValueError(f"Invalid --inventory value: {spec}. Expected NAME=DIR")
+
+        inventories[name] = SaltInventory(inventory_dir=inventory_dir)
+
+    results: dict[str, bool] = render_environments(
+        environments=args.envs,
+        inventories=inventories,
+        template_env=get_loader_env(
+            loader=load_template_dir(
+                templates_dir=f"{TEMPLATES_DIR}/scripts/setup/linux"
+            )
+        ),
+        settings_root=args.settings_root,
+        output_root=args.output_root or SCRIPT_OUTPUT_DIR,
+        max_workers=args.workers,
+        resolver=HostResolver(),
+    )
+    print(json.dumps(results, indent=2))
+
+    return 0 if all(results.values()) else 1
+
+
+def run_discover_command(args: argparse.Namespace) -> int:
+    from salt_ctrl.daemon.server import InventoryState
+    from salt_ctrl.utils.discovery_utils import discover_minions
+
+    state: InventoryState = InventoryState(record_history=not args.no_history)
+
+    if not state.refresh(force=True):
+        minions_file = state.inventory.minions_file
+
+        if minions_file.exists():
+            print(
+                f"Failed loading the inventory, fix {minions_file} or move it away "
+                "before discovering minions",
+                file=sys.stderr,
+            )
+
+            return 1
+
+    sweep_kwargs: dict = {
+        "rate": args.rate,
+        "concurrency": args.concurrency,
+        "timeout": args.timeout,
+    }
+    if args.ports:
+        sweep_kwargs["ports"] = args.ports
+    if args.adaptive:
+        from salt_ctrl.utils.net_utils import RttEstimator
+
+        sweep_kwargs["estimator"] = RttEstimator(
+            initial_rto=args.timeout,
+            min_rto=min(0.1, args.timeout),
+            max_rto=args.timeout,
+        )
+
+    added = discover_minions(
+        inventory=state.inventory,
+        resolver=state.resolver,
+        cidrs=args.cidrs,
+        save=args.save,
+        name_prefix=args.name_prefix,
+        require_open_port=not args.include_closed,
+        **sweep_kwargs,
+    )
+    print(json.dumps([minion.model_dump() for minion in added], indent=2))
+
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    args: argparse.Namespace = parse_args(argv)
+
+    if args.command == "daemon":
+        return run_daemon_command(args)
+    if args.command == "pipeline":
+        return run_pipeline_command(args)
+    if args.command == "discover":
+        return run_discover_command(args)
+    if args.command == "render" and (args.envs or args.inventories):
+        return run_render_batch_command(args)
+
+    request: dict = build_request(args)
+
+    if not args.local and daemon_running(args.socket):
+        response: dict = send_request(request, socket_path=args.socket)
+    else:
+        from salt_ctrl.daemon.server import InventoryState
+
+        response = InventoryState(record_history=not args.no_history).handle(request)
+
+    print(json.dumps(response["detail"], indent=2, default=str))
+
+    return 0 if response["success"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
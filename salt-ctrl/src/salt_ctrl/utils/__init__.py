@@ -1,3 +1,10 @@
 from __future__ import annotations
 
-from . import jinja_utils, net_utils, salt_inventory_utils, dataframe_utils
+from . import (
+    dataframe_utils,
+    discovery_utils,
+    jinja_utils,
+    net_utils,
+    pipeline_utils,
+    salt_inventory_utils,
+)
@@ -0,0 +1,9 @@
+from __future__ import annotations
+
+from .operations import (
+    DiscoveredHost,
+    discover_hosts,
+    discover_minions,
+    discovered_minions,
+    sweep_subnets,
+)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from .operations import (
+    RenderCache,
     get_loader_env,
     load_template,
     load_template_dir,
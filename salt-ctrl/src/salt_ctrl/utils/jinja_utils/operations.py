@@ -1,10 +1,57 @@
 from __future__ import annotations
 
+import json
+
 from pathlib import Path
+import threading
 from typing import Union
 
 from jinja2 import Environment, FileSystemLoader, Template
 
+
+class RenderCache:
+    """Rendered template output, reused for identical template + context pairs.
+
+    Contexts are compared by their JSON form (pydantic models are dumped), so i.e.
+    allow_ports.j2 is rendered once for every node sharing the same ports, and
+    install_minion.j2 once per master. Safe to share between threads.
+    """
+
+    def __init__(self):
+        self.hits: int = 0
+        self.misses: int = 0
+        self._rendered: dict[tuple[str, str], str] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    @staticmethod
+    def context_key(data: dict = None) -> str:
+        return json.dumps(
+            data,
+            sort_keys=True,
+            default=lambda obj: (
+                obj.model_dump(mode="json") if hasattr(obj, "model_dump") else str(obj)
+            ),
+        )
+
+    def render(self, template: Template = None, data: dict = {}) -> str:
+        key: tuple[str, str] = (template.name, self.context_key(data))
+
+        with self._lock:
+            if key in self._rendered:
+                self.hits += 1
+
+                return self._rendered[key]
+
+        ## Rendered outside the lock; a concurrent miss on the same key renders twice
+        rendered: str = template.render(data)
+
+        with self._lock:
+            self.misses += 1
+            self._rendered.setdefault(key, rendered)
+
+        return rendered
+
+
 def load_template_dir(templates_dir: Union[Path, str] = None) -> FileSystemLoader:
     """Create loader for Jinja to open .j2 files."""
     if not templates_dir:
@@ -72,9 +119,17 @@ def load_template(
 
 
 def render_template(
-    template: Template = None, outfile: Union[str, Path] = None, data: dict = {}
+    template: Template = None,
+    outfile: Union[str, Path] = None,
+    data: dict = {},
+    cache: RenderCache | None = None,
+    overwrite: bool = False,
 ) -> bool:
-    """Render a .j2 template to an output file."""
+    """Render a .j2 template to an output file.
+
+    Pass a RenderCache to reuse the output of an earlier render with the same data.
+    Existing output files are skipped, unless overwrite=True.
+    """
     if not template:
         raise ValueError("Missing Jinja Template object")
     if not outfile:
@@ -83,7 +138,7 @@ def render_template(
     if isinstance(outfile, str):
         outfile: Path = Path(outfile)
 
-    if outfile.exists():
+    if outfile.exists() and not overwrite:
         # log.warning(f"Output file '{outfile}' already exists. Skipping render.")
         return False
 
@@ -91,7 +146,7 @@ def render_template(
         outfile.parent.mkdir(parents=True, exist_ok=True)
 
     try:
-        render = template.render(data)
+        render = cache.render(template, data) if cache else template.render(data)
 
         with open(outfile, "w") as out:
             out.write(render)
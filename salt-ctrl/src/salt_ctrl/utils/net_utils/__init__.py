@@ -1,3 +1,17 @@
 from __future__ import annotations
 
-from .operations import ping
+from .operations import (
+    PORT_CLOSED,
+    PORT_FILTERED,
+    PORT_OPEN,
+    AdaptiveProber,
+    AsyncRateLimiter,
+    HostResolver,
+    RetryBudget,
+    RetryPolicy,
+    RttEstimator,
+    parse_ping_rtt,
+    ping,
+    ping_rtt,
+    tcp_probe,
+)
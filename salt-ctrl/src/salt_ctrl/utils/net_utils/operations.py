@@ -1,12 +1,55 @@
 from __future__ import annotations
 
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+import errno
+import ipaddress
+import math
+
+from pathlib import Path
 import platform
+import random
+import re
+import socket
 import subprocess
+import threading
+import time
+from typing import Callable, Iterable, Union
+
+from salt_ctrl.constants import HOSTS_FILE
 
 from loguru import logger as log
 
-def ping(host: str = None):
-    """Attempt to reach a specified host."""
+## tcp_probe() results. A refused connection still proves the host is up.
+PORT_OPEN: str = "open"
+PORT_CLOSED: str = "closed"
+PORT_FILTERED: str = "filtered"
+
+
+## Round-trip time in ping's reply line, i.e. "time=0.045 ms" (Linux, macOS) or
+#  "time<1ms" (Windows)
+_PING_RTT_PATTERN: re.Pattern = re.compile(r"time[=<]\s*([\d.]+)\s*ms")
+
+
+def ping(host: str = None, timeout: float | None = None):
+    """Attempt to reach a specified host.
+
+    Pass timeout (in seconds) to give up waiting for a reply sooner than the system
+    ping's default.
+    """
+    return ping_rtt(host=host, timeout=timeout)[0]
+
+
+def ping_rtt(
+    host: str = None, timeout: float | None = None
+) -> tuple[bool, float | None]:
+    """Ping a host once, returning (up, rtt_ms).
+
+    rtt_ms is the round-trip time ping reports, which leaves out the time it takes to
+    start the ping process. It is None if the host is down, or if ping's output
+    could not be parsed.
+    """
     if host is None:
         raise ValueError(f"Missing host to ping. Pass a hostname/FQDN or IP address.")
 
@@ -16,23 +59,565 @@ def ping(host: str = None):
         )
 
     ## Set ping option based on OS type
-    param: str = "-n" if platform.system().lower() == "windows" else "-c"
+    system: str = platform.system().lower()
+    param: str = "-n" if system == "windows" else "-c"
+
+    command: list[str] = ["ping", param, "1"]
+
+    if timeout is not None:
+        ## Reply wait: milliseconds on Windows & macOS, whole seconds on Linux. The
+        #  subprocess timeout below enforces sub-second timeouts on Linux.
+        match system:
+            case "windows":
+                command += ["-w", str(max(1, int(timeout * 1000)))]
+            case "darwin":
+                command += ["-W", str(max(1, int(timeout * 1000)))]
+            case _:
+                command += ["-W", str(max(1, math.ceil(timeout)))]
 
-    command: list[str] = ["ping", param, "1", host]
+    command.append(host)
 
     try:
-        response: int = (
-            subprocess.call(
-                command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
-            )
-            == 0
+        response: subprocess.CompletedProcess = subprocess.run(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            timeout=timeout,
+            text=True,
+            errors="replace",
         )
 
-        return response
+    except subprocess.TimeoutExpired:
+        return False, None
 
     except Exception as exc:
         log.error(
             Exception(f"Unhandled exception pinging host [{host}]. Details: {exc}")
         )
 
-        return False
+        return False, None
+
+    if response.returncode != 0:
+        return False, None
+
+    return True, parse_ping_rtt(response.stdout)
+
+
+def parse_ping_rtt(output: str = None) -> float | None:
+    """Parse the round-trip time (in ms) from ping's output, or None if there is none."""
+    match: re.Match | None = _PING_RTT_PATTERN.search(output or "")
+
+    return float(match.group(1)) if match else None
+
+
+class RttEstimator:
+    """Smoothed round-trip times per host & per subnet, and probe timeouts from them.
+
+    Follows TCP's retransmission timer (RFC 6298): each sample updates a smoothed RTT
+    (SRTT) and RTT variation (RTTVAR), and the timeout is SRTT + 4 * RTTVAR, clamped
+    to [min_rto, max_rto]. A host without samples uses its subnet's estimate (times
+    subnet_margin), and a host in an unknown subnet uses initial_rto. All values are
+    in seconds.
+
+    Subnets are /subnet_prefix for IPv4 (/64 for IPv6), taken from the address passed
+    with a sample, or from the host itself if it is an IP address.
+    """
+
+    ALPHA: float = 1 / 8
+    BETA: float = 1 / 4
+    K: int = 4
+
+    def __init__(
+        self,
+        initial_rto: float = 1.0,
+        min_rto: float = 0.2,
+        max_rto: float = 5.0,
+        granularity: float = 0.01,
+        subnet_prefix: int = 24,
+        subnet_margin: float = 2.0,
+    ):
+        if not 0 < min_rto <= max_rto:
+            raise ValueError("Timeouts must satisfy 0 < min_rto <= max_rto")
+
+        self.initial_rto: float = initial_rto
+        self.min_rto: float = min_rto
+        self.max_rto: float = max_rto
+        self.granularity: float = granularity
+        self.subnet_prefix: int = subnet_prefix
+        self.subnet_margin: float = subnet_margin
+
+        ## key -> [srtt, rttvar, samples]
+        self._hosts: dict[str, list[float]] = {}
+        self._subnets: dict[str, list[float]] = {}
+        self._subnet_keys: dict[str, str | None] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def _subnet(self, host: str, address: str | None) -> str | None:
+        key: str = address or host
+        if key in self._subnet_keys:
+            return self._subnet_keys[key]
+
+        try:
+            ip = ipaddress.ip_address(key)
+        except ValueError:
+            subnet: str | None = None
+        else:
+            prefix: int = self.subnet_prefix if ip.version == 4 else 64
+            subnet = str(ipaddress.ip_network(f"{ip}/{prefix}", strict=False))
+
+        self._subnet_keys[key] = subnet
+
+        return subnet
+
+    def _update(self, table: dict[str, list[float]], key: str, rtt: float) -> None:
+        entry: list[float] | None = table.get(key, None)
+
+        if entry is None:
+            table[key] = [rtt, rtt / 2, 1]
+
+            return
+
+        srtt, rttvar, samples = entry
+        entry[1] = (1 - self.BETA) * rttvar + self.BETA * abs(srtt - rtt)
+        entry[0] = (1 - self.ALPHA) * srtt + self.ALPHA * rtt
+        entry[2] = samples + 1
+
+    def _rto(self, entry: list[float], margin: float = 1.0) -> float:
+        srtt, rttvar, _ = entry
+        rto: float = (srtt + max(self.granularity, self.K * rttvar)) * margin
+
+        return min(self.max_rto, max(self.min_rto, rto))
+
+    def observe(self, host: str = None, rtt: float = None, address: str | None = None):
+        """Record a successful probe's round-trip time (in seconds)."""
+        if host is None or rtt is None:
+            raise ValueError("Missing host or rtt to observe")
+
+        with self._lock:
+            self._update(self._hosts, host, rtt)
+
+            subnet: str | None = self._subnet(host, address)
+            if subnet is not None:
+                self._update(self._subnets, subnet, rtt)
+
+    def timeout(self, host: str = None, address: str | None = None) -> float:
+        """Probe timeout for host, from its own, its subnet's or the initial estimate."""
+        with self._lock:
+            if host in self._hosts:
+                return self._rto(self._hosts[host])
+
+            subnet: str | None = self._subnet(host, address)
+            if subnet is not None and subnet in self._subnets:
+                return self._rto(self._subnets[subnet], margin=self.subnet_margin)
+
+        return min(self.max_rto, max(self.min_rto, self.initial_rto))
+
+    def stats(self, host: str = None) -> dict | None:
+        """SRTT, RTTVAR (in ms), sample count & current timeout for a host."""
+        with self._lock:
+            entry: list[float] | None = self._hosts.get(host, None)
+
+            if entry is None:
+                return None
+
+            return {
+                "srtt_ms": round(entry[0] * 1000, 3),
+                "rttvar_ms": round(entry[1] * 1000, 3),
+                "samples": int(entry[2]),
+                "rto_ms": round(self._rto(entry) * 1000, 3),
+            }
+
+
+class RetryBudget:
+    """Number of retries left in one sweep, shared between probing threads.
+
+    For sweeps of unknown size (i.e. streamed), pass ratio: every probe counted with
+    add_probe() then adds ratio retries to the budget.
+    """
+
+    def __init__(self, retries: int = 0, ratio: float = 0.0):
+        self.retries: float = retries
+        self.ratio: float = ratio
+        self.spent: int = 0
+        self._lock: threading.Lock = threading.Lock()
+
+    @property
+    def remaining(self) -> int:
+        return math.floor(self.retries - self.spent)
+
+    def add_probe(self) -> None:
+        if not self.ratio:
+            return
+
+        with self._lock:
+            self.retries += self.ratio
+
+    def spend(self) -> bool:
+        """Take one retry from the budget, returning False if it is used up."""
+        with self._lock:
+            if self.spent + 1 > self.retries:
+                return False
+
+            self.spent += 1
+
+            return True
+
+
+@dataclass
+class RetryPolicy:
+    """How often & how soon failed probes are retried.
+
+    A probe gets at most max_attempts tries. Between tries, it sleeps a random time
+    between 0 and base_delay * 2^attempt (capped at max_delay), so retries of many
+    hosts don't line up. Retries across a sweep are capped at budget_ratio of its
+    probes (at least min_budget), so a sweep of mostly dead hosts doesn't multiply
+    its wall time by max_attempts.
+    """
+
+    max_attempts: int = 3
+    base_delay: float = 0.05
+    max_delay: float = 1.0
+    budget_ratio: float = 0.2
+    min_budget: int = 3
+
+    def backoff(self, attempt: int = 0) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+    def budget(self, probes: int | None = 0) -> RetryBudget:
+        """Retry budget for a sweep of probes, or a growing one if probes is None."""
+        if probes is None:
+            return RetryBudget(retries=self.min_budget, ratio=self.budget_ratio)
+
+        return RetryBudget(
+            retries=max(self.min_budget, math.ceil(probes * self.budget_ratio))
+        )
+
+
+class AdaptiveProber:
+    """Ping hosts with timeouts from an RttEstimator, retrying per a RetryPolicy.
+
+    probe_func is called with (host, timeout=seconds), and returns up or (up, rtt_ms).
+    The estimator is fed the rtt_ms it reports (i.e. ping's own measurement), or the
+    wall-clock time of the call when it reports none.
+
+    Each retry doubles the previous timeout (up to the estimator's max_rto), so a
+    host slower than its estimate still answers on a later try instead of being
+    reported unreachable. Call start_sweep() before each sweep to reset the retry
+    budget, or pass each probe() the budget of its own sweep (from retry.budget()) when
+    sweeps run concurrently.
+    """
+
+    def __init__(
+        self,
+        estimator: RttEstimator | None = None,
+        retry: RetryPolicy | None = None,
+        probe_func: Callable[..., Union[bool, tuple[bool, float | None]]] = ping_rtt,
+    ):
+        self.estimator: RttEstimator = estimator or RttEstimator()
+        self.retry: RetryPolicy = retry or RetryPolicy()
+        self.probe_func: Callable[
+            ..., Union[bool, tuple[bool, float | None]]
+        ] = probe_func
+        self.budget: RetryBudget = self.retry.budget()
+
+    def start_sweep(self, probes: int | None = 0) -> RetryBudget:
+        """Reset the retry budget for a sweep of probes (None: of unknown size)."""
+        self.budget = self.retry.budget(probes)
+
+        return self.budget
+
+    def probe(
+        self,
+        host: str = None,
+        address: str | None = None,
+        budget: RetryBudget | None = None,
+    ) -> tuple[bool, float | None]:
+        """Probe a host (at address, if given). Returns (up, rtt_ms or None).
+
+        Retries are taken from budget, or from the budget of the last start_sweep().
+        """
+        if host is None:
+            raise ValueError("Missing host to probe")
+
+        budget = budget or self.budget
+        budget.add_probe()
+
+        timeout: float = self.estimator.timeout(host, address=address)
+
+        for attempt in range(self.retry.max_attempts):
+            start: float = time.perf_counter()
+            result = self.probe_func(address or host, timeout=timeout)
+            elapsed: float = time.perf_counter() - start
+
+            up, rtt_ms = result if isinstance(result, tuple) else (result, None)
+            rtt: float = rtt_ms / 1000 if rtt_ms is not None else elapsed
+
+            if up:
+                self.estimator.observe(host, rtt, address=address)
+
+                return True, rtt * 1000
+
+            if attempt + 1 >= self.retry.max_attempts or not budget.spend():
+                break
+
+            time.sleep(self.retry.backoff(attempt))
+            timeout = min(self.estimator.max_rto, timeout * 2)
+
+        return False, None
+
+
+class AsyncRateLimiter:
+    """Token bucket limiting how often acquire() returns, across asyncio tasks.
+
+    Callers that find the bucket empty reserve a token anyway (the balance goes
+    negative) & sleep until it is theirs, so waiters are released in order at
+    `rate` per second instead of waking up together.
+    """
+
+    def __init__(self, rate: float = 1000.0, burst: int | None = None):
+        if rate <= 0:
+            raise ValueError("rate must be greater than 0")
+
+        self.rate: float = rate
+        self.burst: float = float(burst or max(1, int(rate / 10)))
+        self._tokens: float = self.burst
+        self._last: float = time.monotonic()
+
+    async def acquire(self) -> None:
+        now: float = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+        self._tokens -= 1
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self.rate)
+
+
+async def tcp_probe(host: str = None, port: int = None, timeout: float = 1.0) -> str:
+    """Attempt a TCP connection to host:port.
+
+    Returns PORT_OPEN if the connection was accepted, PORT_CLOSED if it was refused
+    (the host answered with a RST, so it is alive) or PORT_FILTERED if it timed out
+    or the host is unreachable.
+    """
+    if host is None:
+        raise ValueError("Missing host to probe")
+    if port is None:
+        raise ValueError("Missing port to probe")
+
+    loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+
+    try:
+        ## Raw non-blocking socket, cheaper than a full asyncio stream per probe
+        family: int = socket.AF_INET6 if ":" in host else socket.AF_INET
+        sock: socket.socket = socket.socket(family, socket.SOCK_STREAM)
+    except OSError as exc:
+        if exc.errno == errno.EMFILE:
+            raise
+
+        return PORT_FILTERED
+
+    sock.setblocking(False)
+
+    try:
+        await asyncio.wait_for(loop.sock_connect(sock, (host, port)), timeout=timeout)
+    except ConnectionRefusedError:
+        return PORT_CLOSED
+    except (asyncio.TimeoutError, OSError):
+        return PORT_FILTERED
+    finally:
+        sock.close()
+
+    return PORT_OPEN
+
+
+class HostResolver:
+    """Resolve hostnames to IP addresses concurrently, caching the results.
+
+    Lookups run getaddrinfo() on a thread pool, so one slow DNS answer doesn't hold up
+    the others. Addresses are cached for ttl seconds, and failed lookups for
+    negative_ttl seconds. Concurrent lookups of the same host share one query.
+
+    Entries in overrides, or in an /etc/hosts-style hosts_file ("<address> <name>
+    [<alias> ...]" per line), take precedence over DNS & never expire. IPv4 addresses
+    are preferred when a name resolves to both families.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 300.0,
+        negative_ttl: float = 30.0,
+        max_workers: int = 32,
+        timeout: float = 5.0,
+        overrides: dict[str, str] | None = None,
+        hosts_file: Union[Path, str, None] = HOSTS_FILE,
+    ):
+        self.ttl: float = ttl
+        self.negative_ttl: float = negative_ttl
+        self.max_workers: int = max_workers
+        self.timeout: float = timeout
+        self.overrides: dict[str, str] = {}
+
+        if hosts_file is not None and Path(hosts_file).exists():
+            self.load_hosts_file(hosts_file)
+        if overrides:
+            self.overrides.update(overrides)
+
+        ## host -> (expires at, address or None)
+        self._cache: dict[str, tuple[float, str | None]] = {}
+        self._pending: dict[str, Future] = {}
+        self._executor: ThreadPoolExecutor | None = None
+        ## Re-entrant: a lookup that finishes before its done-callback is attached
+        #  runs _store() right away, in the thread that holds the lock
+        self._lock: threading.RLock = threading.RLock()
+
+    def load_hosts_file(self, path: Union[Path, str] = None) -> dict[str, str]:
+        """Add overrides from an /etc/hosts-style file, returning the parsed entries."""
+        if path is None:
+            raise ValueError("Missing hosts file path")
+
+        entries: dict[str, str] = {}
+
+        with open(path) as f:
+            for line in f:
+                fields: list[str] = line.split("#", 1)[0].split()
+                if len(fields) < 2:
+                    continue
+
+                address, names = fields[0], fields[1:]
+                for name in names:
+                    ## First entry wins, like /etc/hosts
+                    entries.setdefault(name, address)
+
+        self.overrides.update(entries)
+        log.debug(f"Loaded [{len(entries)}] host override(s) from {path}")
+
+        return entries
+
+    def _lookup(self, host: str) -> str | None:
+        try:
+            infos = socket.getaddrinfo(host, None, type=socket.SOCK_STREAM)
+        except (socket.gaierror, UnicodeError) as exc:
+            log.debug(f"Could not resolve host [{host}]. Details: {exc}")
+
+            return None
+
+        addresses: list[str] = [info[4][0] for info in infos]
+        ipv4: list[str] = [addr for addr in addresses if ":" not in addr]
+
+        return (ipv4 or addresses or [None])[0]
+
+    def _store(self, host: str, future: Future) -> None:
+        try:
+            address: str | None = future.result()
+        except Exception as exc:
+            log.error(
+                Exception(
+                    f"Unhandled exception resolving host [{host}]. Details: {exc}"
+                )
+            )
+            address = None
+
+        ttl: float = self.ttl if address is not None else self.negative_ttl
+
+        with self._lock:
+            self._cache[host] = (time.monotonic() + ttl, address)
+            self._pending.pop(host, None)
+
+    def _cached(self, host: str) -> tuple[bool, str | None]:
+        """Return (hit, address) from overrides, IP literals or unexpired cache entries."""
+        if host in self.overrides:
+            return True, self.overrides[host]
+
+        try:
+            return True, str(ipaddress.ip_address(host))
+        except ValueError:
+            pass
+
+        entry = self._cache.get(host, None)
+        if entry is not None and entry[0] > time.monotonic():
+            return True, entry[1]
+
+        return False, None
+
+    def _submit(self, host: str) -> Future:
+        ## Caller holds self._lock
+        if host in self._pending:
+            return self._pending[host]
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="resolver"
+            )
+
+        future: Future = self._executor.submit(self._lookup, host)
+        self._pending[host] = future
+        future.add_done_callback(lambda f: self._store(host, f))
+
+        return future
+
+    def resolve(self, host: str = None) -> str | None:
+        """Resolve a single host, returning its address or None if it can't be resolved."""
+        return self.resolve_many([host])[host]
+
+    def resolve_many(self, hosts: Iterable[str] = None) -> dict[str, str | None]:
+        """Resolve hosts concurrently, returning {host: address or None}.
+
+        Lookups still running after self.timeout seconds are reported as None (but
+        not cached, they are picked up by a later call once they finish). A None host
+        (i.e. a node without a host) maps to None.
+        """
+        if hosts is None:
+            raise ValueError("Missing hosts to resolve")
+
+        results: dict[str, str | None] = {}
+        futures: dict[str, Future] = {}
+
+        with self._lock:
+            for host in hosts:
+                if host is None:
+                    results[None] = None
+
+                    continue
+                if host in results or host in futures:
+                    continue
+
+                hit, address = self._cached(host)
+                if hit:
+                    results[host] = address
+                else:
+                    futures[host] = self._submit(host)
+
+        if futures:
+            wait(futures.values(), timeout=self.timeout)
+
+            for host, future in futures.items():
+                results[host] = (
+                    future.result()
+                    if future.done() and future.exception() is None
+                    else None
+                )
+
+        return results
+
+    def unresolvable(self, hosts: Iterable[str] = None) -> list[str]:
+        """Resolve hosts & return the ones that have no address."""
+        return [
+            host
+            for host, address in self.resolve_many(hosts).items()
+            if address is None
+        ]
+
+    def invalidate(self, host: str | None = None) -> None:
+        """Drop a cached result (or every cached result if host is None)."""
+        with self._lock:
+            if host is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(host, None)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
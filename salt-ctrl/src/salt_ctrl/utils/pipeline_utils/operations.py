@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import queue
+import threading
+import time
+from typing import Any, Callable, Iterable
+
+from loguru import logger as log
+
+## Marks the end of a stage's input
+_SENTINEL = object()
+
+
+@dataclass
+class Stage:
+    """A pipeline stage.
+
+    func is called once per item, by `concurrency` worker threads. Its return value
+    is passed to the next stage; returning None drops the item. Set keep_dropped to
+    collect dropped items in Pipeline.dropped[name]. on_finish, if set,
+    is called once after every item has passed through the stage (i.e. to flush
+    buffered output). queue_size bounds the stage's input queue; when it is full,
+    the previous stage blocks until there is room.
+    """
+
+    name: str
+    func: Callable[[Any], Any]
+    concurrency: int = 1
+    queue_size: int = 64
+    on_finish: Callable[[], None] | None = None
+    keep_dropped: bool = False
+
+
+@dataclass
+class StageStats:
+    name: str
+    concurrency: int = 1
+    queue_size: int = 0
+    processed: int = 0
+    dropped: int = 0
+    errors: int = 0
+    busy_seconds: float = 0.0
+    max_queue_depth: int = 0
+    started: float | None = None
+    finished: float | None = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def wall_seconds(self) -> float:
+        if self.started is None or self.finished is None:
+            return 0.0
+
+        return self.finished - self.started
+
+    @property
+    def throughput(self) -> float:
+        """Items processed per second of stage wall time."""
+        if not self.wall_seconds:
+            return 0.0
+
+        return self.processed / self.wall_seconds
+
+    def as_dict(self) -> dict:
+        return {
+            "stage": self.name,
+            "concurrency": self.concurrency,
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "wall_seconds": round(self.wall_seconds, 4),
+            "busy_seconds": round(self.busy_seconds, 4),
+            "items_per_second": round(self.throughput, 2),
+            "max_queue_depth": self.max_queue_depth,
+            "queue_size": self.queue_size,
+        }
+
+
+class Pipeline:
+    """Run items through a chain of stages connected by bounded queues.
+
+    Each stage runs in its own pool of threads, so items flow through the
+    pipeline incrementally and I/O-bound stages (i.e. probing) overlap with
+    CPU-bound ones (i.e. rendering). Bounded queues apply backpressure, keeping
+    at most (sum of queue sizes + workers) items in flight.
+    """
+
+    def __init__(self, stages: list[Stage] = None):
+        if not stages:
+            raise ValueError("Missing list of pipeline stages")
+
+        self.stages: list[Stage] = stages
+        self.stats: list[StageStats] = []
+        self.dropped: dict[str, list[Any]] = {}
+
+    def run(self, items: Iterable = None) -> list[StageStats]:
+        if items is None:
+            raise ValueError("Missing iterable of items to process")
+
+        queues: list[queue.Queue] = [
+            queue.Queue(maxsize=stage.queue_size) for stage in self.stages
+        ]
+        self.stats = [
+            StageStats(
+                name=stage.name,
+                concurrency=stage.concurrency,
+                queue_size=stage.queue_size,
+            )
+            for stage in self.stages
+        ]
+        self.dropped = {stage.name: [] for stage in self.stages if stage.keep_dropped}
+        remaining: list[int] = [stage.concurrency for stage in self.stages]
+        remaining_lock: threading.Lock = threading.Lock()
+
+        def _put(index: int, item: Any) -> None:
+            queues[index].put(item)
+
+            stats: StageStats = self.stats[index]
+            depth: int = queues[index].qsize()
+
+            if depth > stats.max_queue_depth:
+                stats.max_queue_depth = depth
+
+        def _worker(index: int) -> None:
+            stage: Stage = self.stages[index]
+            stats: StageStats = self.stats[index]
+            is_last: bool = index == len(self.stages) - 1
+
+            while True:
+                item = queues[index].get()
+
+                if item is _SENTINEL:
+                    break
+
+                if stats.started is None:
+                    with stats._lock:
+                        if stats.started is None:
+                            stats.started = time.perf_counter()
+
+                start: float = time.perf_counter()
+
+                try:
+                    result = stage.func(item)
+                except Exception as exc:
+                    log.error(
+                        Exception(
+                            f"Unhandled exception in pipeline stage [{stage.name}]. Details: {exc}"
+                        )
+                    )
+
+                    with stats._lock:
+                        stats.errors += 1
+
+                    continue
+                finally:
+                    elapsed: float = time.perf_counter() - start
+
+                    with stats._lock:
+                        stats.busy_seconds += elapsed
+
+                with stats._lock:
+                    if result is None:
+                        stats.dropped += 1
+                        if stage.keep_dropped:
+                            self.dropped[stage.name].append(item)
+                    else:
+                        stats.processed += 1
+
+                if result is not None and not is_last:
+                    _put(index + 1, result)
+
+            ## Last worker out finishes the stage & closes the next stage's input
+            with remaining_lock:
+                remaining[index] -= 1
+                last_worker: bool = remaining[index] == 0
+
+            if last_worker:
+                if stage.on_finish is not None:
+                    try:
+                        stage.on_finish()
+                    except Exception as exc:
+                        log.error(
+                            Exception(
+                                f"Unhandled exception finishing pipeline stage [{stage.name}]. Details: {exc}"
+                            )
+                        )
+                        stats.errors += 1
+
+                stats.finished = time.perf_counter()
+
+                if stats.started is None:
+                    stats.started = stats.finished
+
+                if not is_last:
+                    for _ in range(self.stages[index + 1].concurrency):
+                        queues[index + 1].put(_SENTINEL)
+
+        threads: list[threading.Thread] = []
+
+        for index, stage in enumerate(self.stages):
+            for n in range(stage.concurrency):
+                thread = threading.Thread(
+                    target=_worker,
+                    args=(index,),
+                    name=f"pipeline-{stage.name}-{n}",
+                    daemon=True,
+                )
+                thread.start()
+                threads.append(thread)
+
+        try:
+            for item in items:
+                _put(0, item)
+        finally:
+            ## Close the 1st stage's input even if items raised, so every worker
+            #  drains its queue & exits before the exception propagates
+            for _ in range(self.stages[0].concurrency):
+                queues[0].put(_SENTINEL)
+
+            for thread in threads:
+                thread.join()
+
+        return self.stats
+
+    def summary(self) -> str:
+        """Format per-stage stats from the last run as a table."""
+        rows: list[dict] = [stats.as_dict() for stats in self.stats]
+
+        if not rows:
+            return "Pipeline has not run"
+
+        headers: list[str] = list(rows[0].keys())
+        widths: dict[str, int] = {
+            h: max(len(h), *(len(str(row[h])) for row in rows)) for h in headers
+        }
+
+        lines: list[str] = [
+            " | ".join(h.ljust(widths[h]) for h in headers),
+            "-+-".join("-" * widths[h] for h in headers),
+        ]
+        lines.extend(
+            " | ".join(str(row[h]).ljust(widths[h]) for h in headers) for row in rows
+        )
+
+        return "\n".join(lines)
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 from .operations import (
+    render_environments,
     render_inventory_scripts,
     render_master_scripts,
     render_minion_scripts,
+    run_inventory_pipeline,
 )
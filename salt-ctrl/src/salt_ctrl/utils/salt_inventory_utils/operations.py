@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from concurrent.futures import Future, ThreadPoolExecutor
+
 from pathlib import Path
 from typing import TYPE_CHECKING, Union
 
@@ -9,25 +11,39 @@ from loguru import logger as log
 ## Import class definitions for editor type hinting, without fully importing the module
 if TYPE_CHECKING:
     from salt_ctrl.domain.inventory import SaltInventory, SaltMaster, SaltMinion
-
-from salt_ctrl.constants import SALT_FW_PORTS, TEMPLATE_OUTPUT_DIR, SCRIPT_OUTPUT_DIR
+    from salt_ctrl.domain.reachability import ReachabilityHistory
+    from salt_ctrl.utils.net_utils import AdaptiveProber, HostResolver
+
+from salt_ctrl.constants import (
+    PQ_DIR,
+    SALT_FW_PORTS,
+    SCRIPT_OUTPUT_DIR,
+    TEMPLATE_OUTPUT_DIR,
+)
 from salt_ctrl.utils.jinja_utils import (
+    RenderCache,
     get_loader_env,
     load_template,
     load_template_dir,
     render_template,
 )
+from salt_ctrl.utils.pipeline_utils import Pipeline, Stage
 
 
 def render_master_scripts(
     salt_master: SaltMaster = None,
     template_env: Environment = None,
     output_dir: Union[Path, str] = None,
+    master_address: str | None = None,
+    cache: RenderCache | None = None,
+    overwrite: bool = False,
 ) -> None:
     """Load Jinja templates for Salt master and render scripts to output directory.
 
     A subdirectory with the master's name will be created in the output_dir subdirectory
-    /masters.
+    /masters. Pass master_address (i.e. from a HostResolver) to render the master's
+    resolved IP address instead of its hostname. Pass a RenderCache to reuse renders
+    with identical data. Pass overwrite=True to replace existing scripts.
     """
     if salt_master is None:
         raise ValueError("Missing SaltMaster object")
@@ -66,7 +82,9 @@ def render_master_scripts(
             render_template(
                 template=install_master_templ,
                 outfile=f"{output_dir}/install_master.sh",
-                data={"master": salt_master},
+                data={"master": salt_master, "master_address": master_address},
+                cache=cache,
+                overwrite=overwrite,
             )
 
             log.debug(f"Render allow_ports.j2 to {output_dir}/allow_ports.sh")
@@ -74,6 +92,8 @@ def render_master_scripts(
                 template=allow_ports_templ,
                 outfile=f"{output_dir}/allow_ports.sh",
                 data={"ports": SALT_FW_PORTS},
+                cache=cache,
+                overwrite=overwrite,
             )
         else:
             raise NotImplementedError(
@@ -88,13 +108,22 @@ def render_minion_scripts(
     salt_master: SaltMaster = None,
     salt_minions: list[SaltMinion] = None,
     template_env: Environment = None,
+    master_address: str | None = None,
+    output_root: Union[Path, str] = SCRIPT_OUTPUT_DIR,
+    cache: RenderCache | None = None,
+    overwrite: bool = False,
 ) -> None:
     """Load Jinja templates for Salt master and render scripts to output directory.
 
     Note: With minions, the output directory is created automatically. The output directory
-    path is concatenated from the TEMPLATE_OUTPUT_DIR constant, with /minions as a subdirectory.
+    path is concatenated from output_root (default: the SCRIPT_OUTPUT_DIR constant), with
+    /minions as a subdirectory.
 
     The function loops over a salt_minions list object and creates a directory for each minion.
+    Pass master_address (i.e. from a HostResolver) to point minions at the master's
+    resolved IP address instead of its hostname. Pass a RenderCache to render each
+    template once for all minions, since their contexts are identical. Pass
+    overwrite=True to replace existing scripts.
     """
     if salt_master is None:
         raise ValueError(f"Missing SaltMaster object")
@@ -112,7 +141,7 @@ def render_minion_scripts(
         # log.debug(f"Serialized Salt minion ({type(serial)}): {serial}")
 
         log.info(f"Rendering script templates for Salt minion {minion.name}")
-        output_dir: Path = Path(f"{SCRIPT_OUTPUT_DIR}/minions/{minion.name}")
+        output_dir: Path = Path(f"{output_root}/minions/{minion.name}")
 
         if not output_dir.exists():
             output_dir.mkdir(parents=True, exist_ok=True)
@@ -127,7 +156,9 @@ def render_minion_scripts(
             render_template(
                 template=install_minion_templ,
                 outfile=f"{output_dir}/install_minion.sh",
-                data={"master": salt_master},
+                data={"master": salt_master, "master_address": master_address},
+                cache=cache,
+                overwrite=overwrite,
             )
 
             log.debug(f"Load allow_ports.j2 and render to {output_dir}/allow_ports.sh")
@@ -135,6 +166,8 @@ def render_minion_scripts(
                 template=allow_ports_templ,
                 outfile=f"{output_dir}/allow_ports.sh",
                 data={"ports": SALT_FW_PORTS},
+                cache=cache,
+                overwrite=overwrite,
             )
         except Exception as exc:
             raise Exception(
@@ -143,36 +176,88 @@ def render_minion_scripts(
 
 
 def render_inventory_scripts(
-    inventory: SaltInventory = None, template_loader: FileSystemLoader = None
+    inventory: SaltInventory = None,
+    template_loader: FileSystemLoader = None,
+    template_env: Environment = None,
+    resolver: HostResolver | None = None,
+    output_root: Union[Path, str] = SCRIPT_OUTPUT_DIR,
+    cache: RenderCache | None = None,
+    only_changed: bool = False,
 ) -> bool:
-    """Render master and minion scripts from Jinja templates."""
+    """Render master and minion scripts from Jinja templates.
+
+    Pass an existing template_env to reuse its compiled templates, instead of
+    creating a new Environment from template_loader. Pass a resolver to render the
+    master's resolved address into the scripts. Scripts are written under
+    output_root/masters & output_root/minions.
+
+    Pass only_changed=True to (re-)render only nodes that were added or changed since
+    the last only_changed render to output_root, overwriting their scripts. If the
+    master (or its resolved address) changed, every minion is re-rendered, since
+    their scripts depend on it.
+    """
     if inventory is None:
         raise ValueError("Missing SaltInventory object")
-    if template_loader is None:
+    if template_loader is None and template_env is None:
         raise ValueError(f"Missing Jinja2 FileSystemLoader")
 
-    LOADER_ENV = get_loader_env(loader=template_loader)
+    LOADER_ENV = template_env or get_loader_env(loader=template_loader)
 
     MASTER: SaltMaster = inventory.master
     MINIONS: list[SaltMinion] = inventory.minions
+    MASTER_ADDRESS: str | None = (
+        resolver.resolve(MASTER.host) if resolver is not None else None
+    )
 
-    try:
-        log.info(f"Rendering Salt master scripts")
-        render_master_scripts(
-            salt_master=MASTER,
-            template_env=LOADER_ENV,
-            output_dir=f"{SCRIPT_OUTPUT_DIR}/masters/{MASTER.name}",
-        )
-    except Exception as exc:
-        msg = Exception(f"Unhandled exception rendering master scripts. Details: {exc}")
-        log.error(msg)
+    render_master: bool = True
+    artefact: str | None = None
 
-        return False
+    if only_changed:
+        artefact = f"render:{Path(output_root).resolve()}:{MASTER_ADDRESS}"
+        revisions: dict = inventory.revisions()
+        dirty: list = inventory.dirty(artefact)
+
+        if not dirty:
+            log.debug(f"No inventory changes since last render to {output_root}")
+
+            return True
+
+        ## Minion scripts embed the master, re-render all of them if it changed
+        if not any(node is MASTER for node in dirty):
+            render_master = False
+            MINIONS = [node for node in dirty if node is not MASTER]
+
+        log.info(f"Re-rendering scripts for [{len(dirty)}] changed node(s)")
+
+    if render_master:
+        try:
+            log.info(f"Rendering Salt master scripts")
+            render_master_scripts(
+                salt_master=MASTER,
+                template_env=LOADER_ENV,
+                output_dir=f"{output_root}/masters/{MASTER.name}",
+                master_address=MASTER_ADDRESS,
+                cache=cache,
+                overwrite=only_changed,
+            )
+        except Exception as exc:
+            msg = Exception(
+                f"Unhandled exception rendering master scripts. Details: {exc}"
+            )
+            log.error(msg)
+
+            return False
 
     try:
         log.info(f"Rendering Salt minion scripts")
         render_minion_scripts(
-            salt_master=MASTER, salt_minions=MINIONS, template_env=LOADER_ENV
+            salt_master=MASTER,
+            salt_minions=MINIONS,
+            template_env=LOADER_ENV,
+            master_address=MASTER_ADDRESS,
+            output_root=output_root,
+            cache=cache,
+            overwrite=only_changed,
         )
     except Exception as exc:
         msg = Exception(f"Unhandled exception rendering minion scripts. Details: {exc}")
@@ -180,4 +265,277 @@ def render_inventory_scripts(
 
         return False
 
+    if artefact is not None:
+        inventory.mark_clean(artefact, revisions=revisions)
+
     return True
+
+
+def render_environments(
+    environments: list[str] | None = None,
+    inventories: dict[str, SaltInventory] | None = None,
+    template_env: Environment = None,
+    settings_root: Union[Path, str] = "config",
+    output_root: Union[Path, str] = SCRIPT_OUTPUT_DIR,
+    max_workers: int | None = None,
+    resolver: HostResolver | None = None,
+    cache: RenderCache | None = None,
+) -> dict[str, bool]:
+    """Render scripts for several environments/inventories in a single run.
+
+    Each Dynaconf environment in environments (i.e. ["dev", "prod"]) is loaded from
+    settings_root with a DynaconfInventorySource. Pass inventories to add other named
+    inventories, i.e. SaltInventory(inventory_dir=...) for a JSON inventory directory.
+    Scripts for each are written under output_root/<name>.
+
+    Every environment shares template_env (all templates are compiled once, before
+    rendering starts), one RenderCache, so identical contexts like allow_ports.j2 are
+    rendered once for the whole batch, and the resolver. Environments are loaded &
+    rendered in parallel on up to max_workers threads. Returns {name: success}.
+    """
+    from salt_ctrl.domain.inventory import SaltInventory
+    from salt_ctrl.domain.inventory.sources import DynaconfInventorySource
+
+    if not environments and not inventories:
+        raise ValueError("Missing environments or inventories to render")
+    if template_env is None:
+        raise ValueError("Missing template loader environment")
+
+    targets: dict[str, SaltInventory] = {
+        env: SaltInventory(
+            source=DynaconfInventorySource(root_path=Path(settings_root), env=env)
+        )
+        for env in environments or []
+    }
+
+    duplicates: set[str] = set(targets) & set(inventories or {})
+    if duplicates:
+        raise ValueError(
+            f"Names used for both environments & inventories: {duplicates}"
+        )
+
+    targets.update(inventories or {})
+
+    ## Compile templates before workers start, so they only render
+    for template_name in template_env.list_templates():
+        template_env.get_template(template_name)
+
+    cache = cache or RenderCache()
+
+    def _render(name: str, inventory: SaltInventory) -> bool:
+        if inventory.master is None and not inventory.refresh(force=True):
+            log.error(f"Failed loading inventory for environment [{name}]")
+
+            return False
+
+        log.info(f"Rendering scripts for environment [{name}]")
+
+        return render_inventory_scripts(
+            inventory=inventory,
+            template_env=template_env,
+            resolver=resolver,
+            output_root=f"{output_root}/{name}",
+            cache=cache,
+        )
+
+    with ThreadPoolExecutor(
+        max_workers=max_workers or min(len(targets), 8),
+        thread_name_prefix="render-env",
+    ) as executor:
+        futures: dict[str, Future] = {
+            name: executor.submit(_render, name, inventory)
+            for name, inventory in targets.items()
+        }
+
+    results: dict[str, bool] = {}
+
+    for name, future in futures.items():
+        try:
+            results[name] = future.result()
+        except Exception as exc:
+            msg = Exception(
+                f"Unhandled exception rendering environment [{name}]. Details: {exc}"
+            )
+            log.error(msg)
+
+            results[name] = False
+
+    log.info(
+        f"Rendered [{sum(results.values())}/{len(results)}] environment(s) to {output_root} (render cache: {cache.hits} hit(s), {cache.misses} miss(es))"
+    )
+
+    return results
+
+
+def run_inventory_pipeline(
+    inventory: SaltInventory = None,
+    template_env: Environment = None,
+    probe: bool = True,
+    history: ReachabilityHistory | None = None,
+    output_file: Union[Path, str] = f"{PQ_DIR}/inventory.parquet",
+    export_format: str = "parquet",
+    output_root: Union[Path, str] = SCRIPT_OUTPUT_DIR,
+    chunk_size: int = 500,
+    concurrency: dict[str, int] | None = None,
+    queue_size: int = 64,
+    resolver: HostResolver | None = None,
+    prober: AdaptiveProber | None = None,
+    skip_unreachable: bool = True,
+) -> tuple[Pipeline, SaltMaster]:
+    """Stream minions through validate -> probe -> render -> persist stages.
+
+    The master is validated & rendered up front, since every minion's scripts
+    depend on it. Minions are then streamed from the inventory's source as raw dicts
+    (see InventorySourceBase.stream()) and flow through the pipeline one at a time;
+    the inventory itself is not modified. The persist stage streams rows to
+    output_file with an InventoryExportWriter, in chunks of chunk_size (see
+    SaltInventory.export()).
+
+    Pass concurrency to override per-stage worker counts, i.e. {"probe": 64}. Pass a
+    resolver to probe hosts' cached addresses; unresolvable hosts are reported after
+    the run. Pass a prober for RTT-based probe timeouts, with one retry budget for
+    the run (growing with the number of probes).
+    Unreachable minions are dropped by the probe stage (not rendered or persisted)
+    and kept in pipeline.dropped["probe"]; pass skip_unreachable=False to render &
+    persist them anyway.
+    Scripts are rendered under output_root (default: the SCRIPT_OUTPUT_DIR constant).
+    Returns (pipeline, master), call pipeline.summary() for per-stage throughput &
+    queue depths.
+    """
+    from salt_ctrl.domain.inventory import (
+        InventoryExportWriter,
+        SaltMaster,
+        SaltMinion,
+    )
+    from salt_ctrl.domain.inventory.sources import JSONInventorySource
+
+    if inventory is None:
+        raise ValueError("Missing SaltInventory object")
+    if template_env is None:
+        raise ValueError("Missing template loader environment")
+
+    workers: dict[str, int] = {
+        "validate": 2,
+        "probe": 32,
+        "render": 4,
+        "persist": 1,
+        **(concurrency or {}),
+    }
+
+    source = inventory.source or JSONInventorySource(
+        inventory_dir=inventory.inventory_dir
+    )
+    raw_master, raw_minions = source.stream()
+
+    master: SaltMaster = SaltMaster.model_validate(raw_master)
+
+    master_address: str | None = (
+        resolver.resolve(master.host) if resolver is not None else None
+    )
+
+    if prober is not None:
+        ## The number of minions is only known once they were all streamed
+        prober.start_sweep(None)
+
+    ## Every minion renders with the same context, render each template once
+    cache: RenderCache = RenderCache()
+
+    render_master_scripts(
+        salt_master=master,
+        template_env=template_env,
+        output_dir=f"{output_root}/masters/{master.name}",
+        master_address=master_address,
+        cache=cache,
+    )
+
+    writer = InventoryExportWriter(
+        path=output_file, format=export_format, chunk_size=chunk_size
+    )
+    writer.write(master.as_row())
+
+    unreachable: list[str] = []
+    unresolved: list[str] = []
+
+    def _validate(raw: dict) -> SaltMinion:
+        return SaltMinion.model_validate(raw)
+
+    def _probe(minion: SaltMinion) -> SaltMinion | None:
+        up: bool = minion.reachable(
+            history=history, spinner=False, resolver=resolver, prober=prober
+        )
+
+        if not up:
+            unreachable.append(minion.name)
+
+            ## Resolved (& cached) by reachable()
+            if resolver is not None and resolver.resolve(minion.host) is None:
+                unresolved.append(minion.host)
+
+            if skip_unreachable:
+                return None
+
+        return minion
+
+    def _render(minion: SaltMinion) -> SaltMinion:
+        render_minion_scripts(
+            salt_master=master,
+            salt_minions=[minion],
+            template_env=template_env,
+            master_address=master_address,
+            output_root=output_root,
+            cache=cache,
+        )
+
+        return minion
+
+    def _persist(minion: SaltMinion) -> SaltMinion:
+        writer.write(minion.as_row())
+
+        return minion
+
+    stages: list[Stage] = [
+        Stage(name="validate", func=_validate, concurrency=workers["validate"])
+    ]
+
+    if probe:
+        stages.append(
+            Stage(
+                name="probe",
+                func=_probe,
+                concurrency=workers["probe"],
+                keep_dropped=True,
+            )
+        )
+
+    stages.extend(
+        [
+            Stage(name="render", func=_render, concurrency=workers["render"]),
+            Stage(
+                name="persist",
+                func=_persist,
+                concurrency=workers["persist"],
+                on_finish=writer.close,
+            ),
+        ]
+    )
+
+    for stage in stages:
+        stage.queue_size = queue_size
+
+    pipeline: Pipeline = Pipeline(stages=stages)
+
+    log.info(f"Running inventory pipeline: {' -> '.join(s.name for s in stages)}")
+    pipeline.run(raw_minions)
+    log.info(f"Inventory pipeline finished:\n{pipeline.summary()}")
+
+    if probe:
+        probed: int = pipeline.stats[1].processed + pipeline.stats[1].dropped
+        log.info(
+            f"Probed [{probed}] minion(s): [{probed - len(unreachable)}] up, [{len(unreachable)}] down"
+        )
+        if unreachable:
+            log.warning(f"Unreachable minion(s): {sorted(unreachable)}")
+        if unresolved:
+            log.warning(f"[{len(unresolved)}] unresolvable host(s): {unresolved}")
+
+    return pipeline, master
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import time
+
+from salt_ctrl.utils.net_utils import AdaptiveProber, RttEstimator, parse_ping_rtt
+
+import pytest
+
+LINUX_OUTPUT: str = """PING 10.0.0.1 (10.0.0.1) 56(84) bytes of data.
+64 bytes from 10.0.0.1: icmp_seq=1 ttl=64 time=0.045 ms
+
+--- 10.0.0.1 ping statistics ---
+1 packets transmitted, 1 received, 0% packet loss, time 0ms
+rtt min/avg/max/mdev = 0.045/0.045/0.045/0.000 ms
+"""
+
+WINDOWS_OUTPUT: str = """Pinging 10.0.0.1 with 32 bytes of data:
+Reply from 10.0.0.1: bytes=32 time=12ms TTL=128
+"""
+
+
+@pytest.mark.parametrize(
+    "output,rtt_ms",
+    [
+        (LINUX_OUTPUT, 0.045),
+        (WINDOWS_OUTPUT, 12.0),
+        ("Reply from 10.0.0.1: bytes=32 time<1ms TTL=128", 1.0),
+        ("Request timed out.", None),
+        ("", None),
+    ],
+)
+def test_parse_ping_rtt(output: str, rtt_ms: float | None):
+    assert parse_ping_rtt(output) == rtt_ms
+
+
+def slow_probe(rtt_ms: float | None):
+    """Probe taking 50ms of wall-clock time (i.e. process startup), reporting rtt_ms."""
+
+    def _probe(host: str, timeout: float = None) -> tuple[bool, float | None]:
+        time.sleep(0.05)
+
+        return True, rtt_ms
+
+    return _probe
+
+
+def test_prober_uses_reported_rtt():
+    prober: AdaptiveProber = AdaptiveProber(probe_func=slow_probe(2.0))
+
+    up, rtt_ms = prober.probe("10.0.0.1")
+
+    assert up
+    assert rtt_ms == 2.0
+    assert prober.estimator.stats("10.0.0.1")["srtt_ms"] == 2.0
+
+
+@pytest.mark.parametrize(
+    "probe_func",
+    [slow_probe(None), lambda host, timeout=None: time.sleep(0.05) or True],
+)
+def test_prober_falls_back_to_wall_clock(probe_func):
+    prober: AdaptiveProber = AdaptiveProber(
+        estimator=RttEstimator(), probe_func=probe_func
+    )
+
+    up, rtt_ms = prober.probe("10.0.0.1")
+
+    assert up
+    assert rtt_ms >= 50
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import asyncio
+import socket
+import time
+
+from salt_ctrl.utils.discovery_utils import operations as discovery
+from salt_ctrl.utils.net_utils import (
+    PORT_CLOSED,
+    PORT_OPEN,
+    AsyncRateLimiter,
+    tcp_probe,
+)
+
+import pytest
+
+
+def timed_acquires(limiter: AsyncRateLimiter, count: int, tasks: int = 1) -> float:
+    async def _acquire(n: int) -> None:
+        for _ in range(n):
+            await limiter.acquire()
+
+    async def _run() -> None:
+        await asyncio.gather(*(_acquire(count // tasks) for _ in range(tasks)))
+
+    start: float = time.perf_counter()
+    asyncio.run(_run())
+
+    return time.perf_counter() - start
+
+
+def test_rate_limiter_allows_burst_up_front():
+    limiter: AsyncRateLimiter = AsyncRateLimiter(rate=10.0, burst=20)
+
+    assert timed_acquires(limiter, 20) < 0.05
+
+
+def test_rate_limiter_holds_rate_across_tasks():
+    limiter: AsyncRateLimiter = AsyncRateLimiter(rate=200.0, burst=1)
+
+    ## 1 token up front, the other 39 at 200/s: ~0.195s
+    elapsed: float = timed_acquires(limiter, 40, tasks=4)
+
+    assert 0.18 <= elapsed < 0.5
+
+
+def test_rate_limiter_rejects_invalid_rate():
+    with pytest.raises(ValueError):
+        AsyncRateLimiter(rate=0)
+
+
+def test_concurrency_lowered_to_open_file_limit(monkeypatch: pytest.MonkeyPatch):
+    if discovery.resource is None:
+        pytest.skip("resource module not available")
+
+    monkeypatch.setattr(
+        discovery.resource,
+        "getrlimit",
+        lambda _: (1024, discovery.resource.RLIM_INFINITY),
+    )
+    limit: int = 1024 - discovery._RESERVED_FDS
+
+    assert discovery._max_concurrency(4096) == limit
+    assert discovery._max_concurrency(limit - 1) == limit - 1
+
+
+def test_tcp_probe_open_and_closed_ports():
+    with socket.socket() as listener:
+        listener.bind(("127.0.0.1", 0))
+        listener.listen()
+        open_port: int = listener.getsockname()[1]
+
+        with socket.socket() as unused:
+            unused.bind(("127.0.0.1", 0))
+            closed_port: int = unused.getsockname()[1]
+
+        assert asyncio.run(tcp_probe("127.0.0.1", open_port)) == PORT_OPEN
+        assert asyncio.run(tcp_probe("127.0.0.1", closed_port)) == PORT_CLOSED
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from pathlib import Path
+import time
+
+from salt_ctrl.utils.net_utils import HostResolver
+
+import pytest
+
+
+class CountingLookup:
+    """Stand-in for HostResolver._lookup(), counting DNS queries per host."""
+
+    def __init__(self, addresses: dict[str, str | None]):
+        self.addresses: dict[str, str | None] = addresses
+        self.calls: dict[str, int] = {}
+
+    def __call__(self, host: str) -> str | None:
+        self.calls[host] = self.calls.get(host, 0) + 1
+
+        return self.addresses.get(host, None)
+
+
+@pytest.fixture
+def hosts_file(tmp_path: Path) -> Path:
+    path: Path = tmp_path / "hosts"
+    path.write_text(
+        "# Lab hosts\n"
+        "10.0.0.10 db1 db1.lab.local\n"
+        "\n"
+        "10.0.0.11 web1  # trailing comment\n"
+        "10.0.0.99 db1\n"
+        "malformed\n"
+    )
+
+    return path
+
+
+def resolver_with(
+    lookup: CountingLookup,
+    monkeypatch: pytest.MonkeyPatch,
+    hosts_file: Path | None = None,
+    **kwargs,
+) -> HostResolver:
+    resolver: HostResolver = HostResolver(hosts_file=hosts_file, **kwargs)
+    monkeypatch.setattr(resolver, "_lookup", lookup)
+
+    return resolver
+
+
+def test_hosts_file_overrides(hosts_file: Path, monkeypatch: pytest.MonkeyPatch):
+    lookup: CountingLookup = CountingLookup({})
+    resolver: HostResolver = resolver_with(lookup, monkeypatch, hosts_file)
+
+    assert resolver.resolve_many(["db1", "db1.lab.local", "web1"]) == {
+        "db1": "10.0.0.10",
+        "db1.lab.local": "10.0.0.10",
+        "web1": "10.0.0.11",
+    }
+    ## Overrides never hit DNS
+    assert lookup.calls == {}
+
+
+def test_ip_literals_and_none_skip_lookup(monkeypatch: pytest.MonkeyPatch):
+    lookup: CountingLookup = CountingLookup({})
+    resolver: HostResolver = resolver_with(lookup, monkeypatch)
+
+    assert resolver.resolve("192.0.2.1") == "192.0.2.1"
+    assert resolver.resolve_many([None]) == {None: None}
+    assert lookup.calls == {}
+
+
+def test_results_are_cached_until_ttl(monkeypatch: pytest.MonkeyPatch):
+    lookup: CountingLookup = CountingLookup({"app1": "10.0.1.1"})
+    resolver: HostResolver = resolver_with(lookup, monkeypatch, ttl=0.2)
+
+    assert resolver.resolve("app1") == "10.0.1.1"
+    assert resolver.resolve("app1") == "10.0.1.1"
+    assert lookup.calls["app1"] == 1
+
+    time.sleep(0.3)
+
+    assert resolver.resolve("app1") == "10.0.1.1"
+    assert lookup.calls["app1"] == 2
+
+
+def test_failures_are_cached_until_negative_ttl(monkeypatch: pytest.MonkeyPatch):
+    lookup: CountingLookup = CountingLookup({})
+    resolver: HostResolver = resolver_with(
+        lookup, monkeypatch, ttl=60.0, negative_ttl=0.2
+    )
+
+    assert resolver.resolve("gone1") is None
+    assert resolver.resolve("gone1") is None
+    assert lookup.calls["gone1"] == 1
+
+    ## The host came back, but the failure is still cached
+    lookup.addresses["gone1"] = "10.0.2.1"
+    assert resolver.resolve("gone1") is None
+
+    time.sleep(0.3)
+
+    assert resolver.resolve("gone1") == "10.0.2.1"
+    assert lookup.calls["gone1"] == 2
+
+
+def test_unresolvable_hosts_are_reported(
+    hosts_file: Path, monkeypatch: pytest.MonkeyPatch
+):
+    lookup: CountingLookup = CountingLookup({"app1": "10.0.1.1"})
+    resolver: HostResolver = resolver_with(lookup, monkeypatch, hosts_file)
+
+    assert resolver.unresolvable(["db1", "app1", "gone1", "gone2", "gone1"]) == [
+        "gone1",
+        "gone2",
+    ]
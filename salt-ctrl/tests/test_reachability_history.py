@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import multiprocessing
+
+from pathlib import Path
+
+from salt_ctrl.domain.reachability import ReachabilityHistory
+
+
+def record_probes(history_dir: Path, worker: int, count: int) -> None:
+    history: ReachabilityHistory = ReachabilityHistory(
+        history_dir=history_dir, compact_bytes=10_000
+    )
+
+    for i in range(count):
+        history.record(host=f"10.{worker}.0.{i}", up=True, rtt_ms=1.0)
+
+        if i % 100 == 0:
+            history.compact()
+
+    history.close()
+
+
+def test_record_without_host(tmp_path: Path):
+    history: ReachabilityHistory = ReachabilityHistory(history_dir=tmp_path)
+
+    history.record(name="minion1", up=False)
+    history.close()
+
+    assert len(history.load()) == 1
+
+
+def test_processes_sharing_history_keep_every_probe(tmp_path: Path):
+    workers: int = 4
+    count: int = 500
+
+    processes: list[multiprocessing.Process] = [
+        multiprocessing.Process(target=record_probes, args=(tmp_path, worker, count))
+        for worker in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    assert all(process.exitcode == 0 for process in processes)
+
+    history: ReachabilityHistory = ReachabilityHistory(history_dir=tmp_path)
+    history.compact()
+
+    probes = history.load()
+
+    assert len(probes) == workers * count
+    assert probes["host"].nunique() == workers * count
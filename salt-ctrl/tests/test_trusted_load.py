@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import json
+
+from pathlib import Path
+
+from salt_ctrl.benchmarks.trusted_load import synthetic_inventory
+from salt_ctrl.domain.inventory import (
+    SaltInventory,
+    SnapshotInventorySource,
+    TrustedChecksums,
+)
+from salt_ctrl.domain.inventory.sources import DynaconfInventorySource
+
+import pytest
+
+
+@pytest.fixture
+def snapshot(tmp_path: Path) -> Path:
+    """Write a synthetic inventory snapshot & trust its checksum."""
+    path: Path = tmp_path / "inventory.json"
+    trust_store: TrustedChecksums = TrustedChecksums(path=tmp_path / "trusted.json")
+
+    synthetic_inventory(100).model_copy(
+        update={"trust_store": trust_store}
+    ).save_snapshot(path)
+
+    return path
+
+
+def load(snapshot: Path, trusted: bool = True) -> SaltInventory:
+    inventory: SaltInventory = SaltInventory(
+        source=SnapshotInventorySource(path=snapshot),
+        trust_store=(
+            TrustedChecksums(path=snapshot.parent / "trusted.json") if trusted else None
+        ),
+    )
+    inventory.refresh()
+
+    return inventory
+
+
+def tamper(snapshot: Path, field: str, value) -> None:
+    with open(snapshot) as f:
+        data: dict = json.load(f)
+
+    data["minions"][0][field] = value
+
+    with open(snapshot, "w") as f:
+        json.dump(data, f)
+
+
+def test_trusted_snapshot_skips_validation(snapshot: Path):
+    inventory: SaltInventory = load(snapshot)
+
+    assert inventory.loaded_trusted
+
+
+def test_trusted_load_matches_validated_load(snapshot: Path):
+    trusted: SaltInventory = load(snapshot)
+    validated: SaltInventory = load(snapshot, trusted=False)
+
+    assert not validated.loaded_trusted
+    assert trusted.master == validated.master
+    assert trusted.minions == validated.minions
+    assert [m.model_fields_set for m in trusted.minions] == [
+        m.model_fields_set for m in validated.minions
+    ]
+
+
+def test_trusted_objects_track_changes(snapshot: Path):
+    minion = load(snapshot).minions[0]
+    minion.cached_dump()
+
+    minion.host = "10.255.255.254"
+
+    assert minion.revision == 1
+    assert minion.cached_dump()["host"] == "10.255.255.254"
+
+
+def test_tampered_valid_snapshot_is_revalidated(snapshot: Path):
+    tamper(snapshot, "host", "10.255.255.255")
+
+    inventory: SaltInventory = load(snapshot)
+
+    assert inventory.minions is not None
+    assert not inventory.loaded_trusted
+    assert inventory.minions[0].host == "10.255.255.255"
+
+
+def test_tampered_invalid_snapshot_is_rejected(snapshot: Path):
+    tamper(snapshot, "name", {"not": "a string"})
+
+    inventory: SaltInventory = SaltInventory(
+        source=SnapshotInventorySource(path=snapshot),
+        trust_store=TrustedChecksums(path=snapshot.parent / "trusted.json"),
+    )
+
+    assert not inventory.refresh()
+    assert inventory.minions is None
+
+
+def test_checksums_are_trusted_per_source(tmp_path: Path):
+    trust_store: TrustedChecksums = TrustedChecksums(path=tmp_path / "trusted.json")
+    trust_store.trust("abc", "source-a")
+
+    assert trust_store.is_trusted("abc", "source-a")
+    assert not trust_store.is_trusted("abc", "source-b")
+    assert not trust_store.is_trusted("abc")
+
+
+def test_trust_does_not_carry_across_dynaconf_envs(tmp_path: Path):
+    inventory: SaltInventory = synthetic_inventory(10)
+    master: dict = inventory.master.model_dump()
+
+    with open(tmp_path / "settings.json", "w") as f:
+        json.dump(
+            {
+                "dev": {
+                    "salt_master": master,
+                    "salt_minions": [m.model_dump() for m in inventory.minions],
+                },
+                "prod": {
+                    "salt_master": master,
+                    "salt_minions": [{"name": 123, "host": ["not", "a", "host"]}],
+                },
+            },
+            f,
+        )
+
+    def load_env(env: str) -> tuple[SaltInventory, bool]:
+        inventory: SaltInventory = SaltInventory(
+            source=DynaconfInventorySource(
+                root_path=tmp_path, settings_files=["settings.json"], env=env
+            ),
+            trust_store=TrustedChecksums(path=tmp_path / "trusted.json"),
+        )
+
+        return inventory, inventory.refresh()
+
+    ## The 1st load validates & trusts dev, the 2nd skips validation
+    load_env("dev")
+    dev, loaded = load_env("dev")
+    assert loaded and dev.loaded_trusted
+
+    prod, loaded = load_env("prod")
+    assert not loaded
+    assert not prod.loaded_trusted
+    assert prod.minions is None